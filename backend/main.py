@@ -3,18 +3,26 @@
 Версия 1.0
 """
 
+import os
+import time
 import warnings
+from functools import lru_cache
+import joblib
 import optuna
 import yaml
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi import File
 from pydantic import BaseModel
 
 from src.pipelines.pipeline import pipeline_training, pipeline_training_future
 from src.data.get_metrics import load_dict_metrics
 from src.data.get_data import get_dataset
+from src.data.storage import NewsIndex
+from src.models.nlp import RelatedNews
+from src.utils import ModelRegistry, run_profile, stage
+from src.pipelines import pipeline_backtest, pipeline_collect, pipeline_embeddings
 
 warnings.filterwarnings('ignore')
 optuna.logging.set_verbosity(optuna.logging.WARNING)
@@ -32,8 +40,71 @@ CONFIG_PATH = '../config/params.yml'
 #     """
 #     return {"message": "Hello World"}
 
+def load_config():
+    """
+    Загрузка конфигурационного файла
+    return: dict
+    """
+    with open(CONFIG_PATH, encoding='utf-8') as file:
+        return yaml.load(file, Loader=yaml.FullLoader)
+
+@lru_cache(maxsize=1)
+def get_news_index():
+    """
+    Индекс новостей, открывается один раз на процесс
+    return: NewsIndex
+    """
+    return NewsIndex(load_config()['news']['index_path'])
+
+@lru_cache(maxsize=1)
+def get_related_news():
+    """
+    Поиск связанных новостей по эмбеддингам
+    return: RelatedNews
+    """
+    return RelatedNews(get_news_index(), load_config()['embeddings'])
+
+def profiled(config, name, profile=False):
+    """
+    Профилируемый запуск: отчет по этапам в report/run_report_<name>.json,
+    при profile=True дополнительно стеки семплирующего профилировщика
+    return: контекстный менеджер запуска
+    """
+    cfg = config['profiling']
+    return run_profile(name, cfg['report_dir'], sampling=profile or cfg['sampling'],
+                       sampling_interval=cfg['sampling_interval'], trace_memory=cfg['trace_memory'])
+
+def register_model(config, name, model_path, params_path, data_path, metrics=None):
+    """
+    Регистрация обученной пайплайном модели новой версией в реестре моделей
+    return: номер версии
+    """
+    params = joblib.load(params_path) if os.path.exists(params_path) else None
+    registry = ModelRegistry(config['registry']['root'])
+    return registry.register_artifact(name, model_path, params=params, metrics=metrics, data_path=data_path)
+
+@app.on_event("startup")
+def register_existing_models():
+    """
+    Регистрация моделей, обученных до появления реестра: если у модели нет текущей
+    версии, уже сохраненный пайплайном артефакт становится ее первой версией
+    return: None
+    """
+    config = load_config()
+    registry = ModelRegistry(config['registry']['root'])
+    models = [
+        (config['registry']['test_model'], config['train']['model_path'], config['train']['params_path']),
+        (config['registry']['future_model'], config['train']['model_path_future'],
+         config['train']['params_path_future']),
+    ]
+    for name, model_path, params_path in models:
+        if registry.current_version(name) is None and os.path.exists(model_path):
+            params = joblib.load(params_path) if os.path.exists(params_path) else None
+            version = registry.register_artifact(name, model_path, params=params)
+            print(f"Модель {model_path} зарегистрирована как {name} {version}")
+
 @app.post("/train_test")
-def train_test():
+def train_test(profile: bool = False):
     """
     Train test model, logging metrics
     return: None
@@ -41,20 +112,167 @@ def train_test():
     with open(CONFIG_PATH, encoding='utf-8') as file:
         config = yaml.load(file, Loader=yaml.FullLoader)
     dict_metrics_path = config['train']['dict_metrics_path']
-    pipeline_training(config_path=CONFIG_PATH)
-    dict_metrics = load_dict_metrics(dict_metrics_path)
-    return {"message": "Model trained", "metrics": dict_metrics}
+    with profiled(config, 'train_test', profile) as report:
+        with stage('pipeline_training'):
+            pipeline_training(config_path=CONFIG_PATH)
+        dict_metrics = load_dict_metrics(dict_metrics_path)
+        with stage('register_model'):
+            version = register_model(config, config['registry']['test_model'], config['train']['model_path'],
+                                     config['train']['params_path'], config['train']['train_path'], dict_metrics)
+    return {"message": "Model trained", "metrics": dict_metrics, "version": version,
+            "stages": report.summary()}
 
 @app.post("/train_future")
-def train_future():
+def train_future(profile: bool = False):
     """
     Train future model
     return: None
     """
     with open(CONFIG_PATH, encoding='utf-8') as file:
         config = yaml.load(file, Loader=yaml.FullLoader)
-    pipeline_training_future(config_path=CONFIG_PATH)
-    return {"message": "Model trained"}
+    with profiled(config, 'train_future', profile) as report:
+        with stage('pipeline_training_future'):
+            pipeline_training_future(config_path=CONFIG_PATH)
+        with stage('register_model'):
+            version = register_model(config, config['registry']['future_model'], config['train']['model_path_future'],
+                                     config['train']['params_path_future'], config['train']['df_path'])
+    return {"message": "Model trained", "version": version, "stages": report.summary()}
+
+@app.get("/models/{name}")
+def model_versions(name: str):
+    """
+    Версии модели в реестре и текущая версия
+    return: список версий с метаданными
+    """
+    registry = ModelRegistry(load_config()['registry']['root'])
+    try:
+        versions = [registry.metadata(name, version) for version in registry.list_versions(name)]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"name": name, "current": registry.current_version(name), "versions": versions}
+
+@app.post("/models/{name}/promote")
+def model_promote(name: str, version: str):
+    """
+    Переключение текущей версии модели (в том числе откат на предыдущую)
+    return: текущая версия
+    """
+    registry = ModelRegistry(load_config()['registry']['root'])
+    try:
+        registry.set_current(name, version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"name": name, "current": version}
+
+@app.post("/backtest")
+def backtest(top: int = 10, profile: bool = False):
+    """
+    Бэктест сетки параметров сигнала по тональности новостей
+    return: лучшие комбинации параметров по sharpe
+    """
+    start_time = time.perf_counter()
+    try:
+        with profiled(load_config(), 'backtest', profile):
+            report = pipeline_backtest(config_path=CONFIG_PATH)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    elapsed = time.perf_counter() - start_time
+    return {"message": "Backtest finished", "combinations": len(report),
+            "combinations_per_second": round(len(report) / elapsed, 1),
+            "top": report.head(top).to_dict(orient='records')}
+
+@app.post("/collect")
+def collect(profile: bool = False):
+    """
+    Параллельный сбор новостей из всех источников в индекс новостей
+    return: количество добавленных новостей по источникам
+    """
+    with profiled(load_config(), 'collect', profile) as report:
+        added = pipeline_collect(config_path=CONFIG_PATH)
+    return {"message": "News collected", "added": added, "stages": report.summary()}
+
+@app.get("/news/search")
+def news_search(q: str = '', coin: str = None, tag: str = None, source: str = None,
+                date_from: str = None, date_to: str = None, limit: int = 10):
+    """
+    Поиск новостей по тексту и фасетам (монета, тег, источник, даты)
+    return: top-k новостей с оценками тональности
+    """
+    limit = max(1, min(limit, load_config()['news']['search_limit_max']))
+    start_time = time.perf_counter()
+    try:
+        results = get_news_index().search(query=q, coin=coin, tag=tag, source=source,
+                                          date_from=date_from, date_to=date_to, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    return {"count": len(results), "took_ms": round(elapsed_ms, 2), "results": results}
+
+@app.get("/news/version")
+def news_version():
+    """
+    Версия данных индекса новостей для инвалидации кэша на клиенте
+    return: номер версии
+    """
+    return {"version": get_news_index().data_version()}
+
+@app.get("/news/coins")
+def news_coins(limit: int = 100):
+    """
+    Монеты с количеством новостей из предрасчитанных агрегатов
+    return: список монет
+    """
+    return {"coins": get_news_index().coins(limit=limit)}
+
+@app.get("/news/tone_by_coin")
+def news_tone_by_coin(coin: str, date_from: str = None, date_to: str = None):
+    """
+    Дневной ряд тональности новостей по монете из предрасчитанных агрегатов
+    return: версия данных и ряд по дням
+    """
+    index = get_news_index()
+    try:
+        series = index.tone_by_coin(coin, date_from=date_from, date_to=date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"coin": coin, "version": index.data_version(), "series": series}
+
+@app.post("/news/embeddings")
+def news_embeddings(profile: bool = False):
+    """
+    Расчет эмбеддингов новых новостей и обновление ANN индекса
+    return: количество новых эмбеддингов
+    """
+    with profiled(load_config(), 'embeddings', profile) as report:
+        added = pipeline_embeddings(config_path=CONFIG_PATH)
+    return {"message": "Embeddings updated", "added": added, "stages": report.summary()}
+
+@app.get("/news/related")
+def news_related(doc_id: int = None, q: str = None, k: int = 10):
+    """
+    Семантически близкие новости к новости doc_id или к тексту q
+    return: top-k новостей со сходством
+    """
+    k = max(1, min(k, load_config()['news']['search_limit_max']))
+    related = get_related_news()
+    start_time = time.perf_counter()
+    try:
+        if doc_id is not None:
+            results = related.related(doc_id, k=k)
+        elif q:
+            results = related.similar_to_text(q, k=k)
+        else:
+            raise HTTPException(status_code=400, detail="Укажите doc_id или q")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="ANN индекс не построен")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Эмбеддинг новости {doc_id} не рассчитан")
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    return {"count": len(results), "took_ms": round(elapsed_ms, 2), "results": results}
 
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8000)
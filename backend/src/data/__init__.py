@@ -2,8 +2,10 @@
 Модуль для работы с данными:
 - Сбор данных (collectors)
 - Обработка данных (processors)
+- Хранилища данных (storage)
 """
 
-from .collectors import CryptoNewsParser
+from .collectors import CryptoNewsParser, CollectorScheduler
+from .storage import NewsIndex
 
-__all__ = ['CryptoNewsParser']
+__all__ = ['CryptoNewsParser', 'CollectorScheduler', 'NewsIndex']
@@ -3,8 +3,16 @@
 - Новости криптовалют
 - Цены криптовалют
 - Торговые индикаторы
+
+Новые источники реализуют интерфейс BaseCollector (страница -> нормализованная запись)
+и регистрируются в COLLECTOR_TYPES; CollectorScheduler запускает их параллельно.
 """
 
 from .crypto_news_parser import CryptoNewsParser
+from .base import BaseCollector, RateLimiter
+from .coinmarketcap import CoinMarketCapNewsCollector
+from .rss import RssNewsCollector
+from .scheduler import CollectorScheduler, COLLECTOR_TYPES, build_collectors
 
-__all__ = ['CryptoNewsParser'] 
\ No newline at end of file
+__all__ = ['CryptoNewsParser', 'BaseCollector', 'RateLimiter', 'CoinMarketCapNewsCollector',
+           'RssNewsCollector', 'CollectorScheduler', 'COLLECTOR_TYPES', 'build_collectors'] 
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Базовый интерфейс сборщиков новостей.
+
+Сборщик отвечает только за источник: получение страницы сырых данных
+и приведение элемента к нормализованной записи. Планирование, ограничение
+частоты запросов, водяные знаки и запись в хранилище выполняет CollectorScheduler.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import requests
+
+# Поля нормализованной записи новости (совпадают с колонками CryptoNewsParser)
+NEWS_FIELDS = ['id', 'title', 'description', 'content', 'published_at', 'url',
+               'source', 'category', 'tags', 'coins', 'cover_image']
+
+
+class RateLimiter:
+    def __init__(self, rate):
+        """
+        Ограничитель частоты запросов к одному источнику.
+
+        Args:
+            rate: Максимальное количество запросов в секунду
+        """
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self):
+        """Ожидание слота для следующего запроса."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class BaseCollector(ABC):
+    def __init__(self, name, rate_limit=1.0, max_pages=10, timeout=30, max_retries=3):
+        """
+        Args:
+            name: Уникальное имя источника (ключ водяного знака)
+            rate_limit: Максимальное количество запросов в секунду к источнику
+            max_pages: Максимальное количество страниц за один запуск
+            timeout: Таймаут HTTP запроса в секундах
+            max_retries: Количество повторов при сетевых ошибках, 429 и 5xx
+        """
+        self.name = name
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = requests.Session()
+
+    def request(self, url, params=None):
+        """
+        HTTP GET с учетом ограничения частоты и повторами с экспоненциальной задержкой.
+
+        Args:
+            url: Адрес
+            params: Параметры запроса
+
+        Returns:
+            requests.Response: Успешный ответ
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return response
+                error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt < self.max_retries:
+                time.sleep(2 ** attempt)
+        raise error
+
+    @abstractmethod
+    def fetch_page(self, page):
+        """
+        Получение страницы сырых элементов от новых к старым.
+
+        Args:
+            page: Номер страницы, начиная с 1
+
+        Returns:
+            list: Сырые элементы; пустой список означает конец данных
+        """
+
+    @abstractmethod
+    def normalize(self, item, position):
+        """
+        Приведение сырого элемента к нормализованной записи.
+
+        Args:
+            item: Сырой элемент страницы
+            position: Позиция элемента на странице
+
+        Returns:
+            dict: Запись с полями NEWS_FIELDS или None, если элемент нужно пропустить
+        """
@@ -0,0 +1,71 @@
+"""
+Сборщик новостей CoinMarketCap.
+"""
+
+from .base import BaseCollector
+
+NEWS_URL = "https://api.coinmarketcap.com/content/v3/news"
+
+
+def normalize_coinmarketcap_news(news, position):
+    """
+    Приведение новости из ответа API CoinMarketCap к нормализованной записи.
+
+    Args:
+        news: Элемент списка 'data' ответа API
+        position: Позиция новости в ответе (для генерации ID при его отсутствии)
+
+    Returns:
+        dict: Нормализованная запись новости
+    """
+    # Основные данные находятся в поле 'meta'
+    meta = news.get('meta', {})
+
+    # Создаем уникальный ID если он отсутствует
+    news_id = meta.get('id')
+    if not news_id:
+        news_id = f"generated-{position}-{hash(meta.get('sourceUrl', ''))}"
+
+    # Извлекаем информацию о связанных криптовалютах
+    coin_names = []
+    if 'assets' in news and isinstance(news['assets'], list):
+        for asset in news['assets']:
+            coin_name = asset.get('name', '')
+            if coin_name:
+                coin_names.append(coin_name)
+
+    return {
+        'id': news_id,
+        'title': meta.get('title', ''),
+        'description': meta.get('subtitle', ''),  # subtitle используется как описание
+        'content': meta.get('content', ''),  # полный HTML-контент новости (может быть не у всех)
+        'published_at': meta.get('releasedAt', ''),  # дата публикации
+        'url': meta.get('sourceUrl', ''),
+        'source': meta.get('sourceName', ''),
+        'category': news.get('category', ''),
+        'tags': ', '.join([tag.get('name', '') for tag in news.get('tags', [])]),
+        'coins': ', '.join(coin_names),
+        'cover_image': news.get('cover', '')  # URL изображения
+    }
+
+
+class CoinMarketCapNewsCollector(BaseCollector):
+    def __init__(self, name='coinmarketcap', page_size=200, language='ru', **kwargs):
+        """
+        Args:
+            name: Имя источника
+            page_size: Количество новостей на странице
+            language: Язык новостей
+            **kwargs: Параметры BaseCollector (rate_limit, max_pages, ...)
+        """
+        super().__init__(name, **kwargs)
+        self.page_size = page_size
+        self.language = language
+
+    def fetch_page(self, page):
+        params = {'page': page, 'size': self.page_size, 'language': self.language}
+        return self.request(NEWS_URL, params=params).json().get('data', [])
+
+    def normalize(self, item, position):
+        record = normalize_coinmarketcap_news(item, position)
+        return record if record['url'] else None
@@ -1,4 +1,5 @@
 import os
+import sys
 import requests
 import pandas as pd
 import json
@@ -8,6 +9,17 @@ from pathlib import Path
 import yaml
 import pprint
 
+# Запуск файлом (python src/data/collectors/crypto_news_parser.py): относительные
+# импорты разрешаются от пакета src, лежащего в директории backend
+if __package__ in (None, ''):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    import src.data.collectors  # noqa: F401
+    __package__ = 'src.data.collectors'
+
+from ..storage import NewsIndex
+from ...utils.profiling import run_profile, stage
+from .coinmarketcap import NEWS_URL, normalize_coinmarketcap_news
+
 def get_project_root():
     """
     Функция для получения корневой директории проекта.
@@ -35,7 +47,7 @@ class CryptoNewsParser:
             self.api_key = self._load_api_key_from_config(config_path)
             
         self.base_url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/listings/latest"
-        self.news_url = "https://api.coinmarketcap.com/content/v3/news"
+        self.news_url = NEWS_URL
         
     def _load_api_key_from_config(self, config_path):
         """Загрузка API ключа из конфигурационного файла."""
@@ -93,36 +105,8 @@ class CryptoNewsParser:
                 # Обработка новостей
                 processed_news = []
                 for i, news in enumerate(news_items):
-                    # Основные данные находятся в поле 'meta'
-                    meta = news.get('meta', {})
-                    
-                    # Создаем уникальный ID если он отсутствует
-                    news_id = meta.get('id')
-                    if not news_id:
-                        news_id = f"generated-{i}-{hash(meta.get('sourceUrl', ''))}"
-                    
-                    # Извлекаем информацию о связанных криптовалютах
-                    coin_names = []
-                    if 'assets' in news and isinstance(news['assets'], list):
-                        for asset in news['assets']:
-                            coin_name = asset.get('name', '')
-                            if coin_name:
-                                coin_names.append(coin_name)
-                    
-                    # Формируем данные новости с правильными полями из meta
-                    news_item = {
-                        'id': news_id,
-                        'title': meta.get('title', ''),
-                        'description': meta.get('subtitle', ''),  # subtitle используется как описание
-                        'content': meta.get('content', ''),  # полный HTML-контент новости (может быть не у всех)
-                        'published_at': meta.get('releasedAt', ''),  # дата публикации
-                        'url': meta.get('sourceUrl', ''),
-                        'source': meta.get('sourceName', ''),
-                        'category': news.get('category', ''),
-                        'tags': ', '.join([tag.get('name', '') for tag in news.get('tags', [])]),
-                        'coins': ', '.join(coin_names),
-                        'cover_image': news.get('cover', '')  # URL изображения
-                    }
+                    news_item = normalize_coinmarketcap_news(news, i)
+                    news_id = news_item['id']
                     
                     # Проверка на пустой URL
                     if news_item['url']:
@@ -165,7 +149,7 @@ class CryptoNewsParser:
             traceback.print_exc()
             return None
             
-    def save_news(self, output_path, limit=100, pages=20, filename="crypto_news.csv"):
+    def save_news(self, output_path, limit=100, pages=20, filename="crypto_news.csv", index_path=None):
         """
         Получение и сохранение новостей в единый CSV файл с проверкой на дубликаты.
         
@@ -174,6 +158,8 @@ class CryptoNewsParser:
             limit: Количество новостей на страницу
             pages: Количество страниц для получения
             filename: Имя файла для сохранения (по умолчанию crypto_news.csv)
+            index_path: Путь к индексу новостей NewsIndex (опционально),
+                новые новости добавляются в него инкрементально
             
         Returns:
             Path: Путь к сохраненному файлу
@@ -211,7 +197,8 @@ class CryptoNewsParser:
         all_news = []
         for page in range(1, pages + 1):
             print(f"Получение страницы {page} из {pages}...")
-            news_df = self.get_latest_news(limit=limit, page=page)
+            with stage('fetch_page'):
+                news_df = self.get_latest_news(limit=limit, page=page)
             
             if news_df is not None and not news_df.empty:
                 all_news.append(news_df)
@@ -302,10 +289,17 @@ class CryptoNewsParser:
                     print(f"Не удалось выполнить сортировку даже с форматом 'mixed': {e2}")
         
         # Сохранение в CSV
-        combined_news.to_csv(file_path, index=False)
+        with stage('save_csv'):
+            combined_news.to_csv(file_path, index=False)
         print(f"Всего новостей в файле: {len(combined_news)}")
         print(f"Новости сохранены в {file_path}")
         
+        # Инкрементальное обновление поискового индекса только новыми новостями
+        if index_path is not None:
+            with stage('update_index'), NewsIndex(index_path) as index:
+                added = index.add_news(new_news)
+                print(f"Добавлено в индекс {added} новостей. Всего в индексе: {len(index)}")
+        
         return file_path
 
     def analyze_api_response(self, limit=10, page=1, save_to_file=True):
@@ -413,6 +407,7 @@ def main():
     
     # Путь для сохранения новостей с использованием относительного пути
     output_path = base_dir / "data" / "raw" / "news"
+    index_path = base_dir / "data" / "news_index.db"
     
     # Создание экземпляра парсера
     try:
@@ -426,13 +421,17 @@ def main():
             parser = CryptoNewsParser(api_key=api_key)
             print("Используется жестко закодированный API ключ.")
         
-        # Получение и сохранение новостей в единый файл с проверкой на дубликаты
-        parser.save_news(output_path, limit=200, pages=25, filename="crypto_news.csv")
-        
-        print("\n---- Загрузка дополнительных новостей для более полного покрытия ----")
-        
-        # Получаем еще 5 страниц с большим количеством новостей на страницу
-        parser.save_news(output_path, limit=300, pages=5, filename="crypto_news.csv")
+        # Отчет о длительности этапов сохраняется в report/run_report_crypto_news_parser.json
+        with run_profile('crypto_news_parser', base_dir / "report"):
+            # Получение и сохранение новостей в единый файл с проверкой на дубликаты
+            with stage('save_news'):
+                parser.save_news(output_path, limit=200, pages=25, filename="crypto_news.csv", index_path=index_path)
+            
+            print("\n---- Загрузка дополнительных новостей для более полного покрытия ----")
+            
+            # Получаем еще 5 страниц с большим количеством новостей на страницу
+            with stage('save_news_extra'):
+                parser.save_news(output_path, limit=300, pages=5, filename="crypto_news.csv", index_path=index_path)
     except Exception as e:
         print(f"Ошибка при выполнении парсера: {e}")
 
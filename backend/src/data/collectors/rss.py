@@ -0,0 +1,72 @@
+"""
+Сборщик новостей из RSS 2.0 и Atom лент.
+"""
+
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+
+from .base import BaseCollector
+
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_CONTENT = '{http://purl.org/rss/1.0/modules/content/}encoded'
+
+
+def _find_text(element, *paths):
+    """Текст первого найденного дочернего элемента из списка путей."""
+    for path in paths:
+        child = element.find(path)
+        if child is not None and child.text:
+            return child.text.strip()
+    return ''
+
+
+def _to_iso(value):
+    """Дата RSS (RFC 822) в ISO 8601; даты Atom уже в ISO 8601."""
+    try:
+        return parsedate_to_datetime(value).isoformat()
+    except (TypeError, ValueError):
+        return value
+
+
+class RssNewsCollector(BaseCollector):
+    def __init__(self, name, url, coins='', **kwargs):
+        """
+        Args:
+            name: Имя источника
+            url: Адрес RSS/Atom ленты
+            coins: Монеты, к которым относятся все новости ленты (например, 'Bitcoin')
+            **kwargs: Параметры BaseCollector (rate_limit, timeout, ...)
+        """
+        kwargs.setdefault('max_pages', 1)
+        super().__init__(name, **kwargs)
+        self.url = url
+        self.coins = coins
+
+    def fetch_page(self, page):
+        # Лента не поддерживает пагинацию: все элементы приходят на первой странице
+        if page > 1:
+            return []
+        root = ET.fromstring(self.request(self.url).content)
+        return root.findall('./channel/item') or root.findall(f'{_ATOM}entry')
+
+    def normalize(self, item, position):
+        link = _find_text(item, 'link')
+        atom_link = item.find(f'{_ATOM}link')
+        if not link and atom_link is not None:
+            link = atom_link.get('href', '')
+        if not link:
+            return None
+
+        return {
+            'id': _find_text(item, 'guid', f'{_ATOM}id') or link,
+            'title': _find_text(item, 'title', f'{_ATOM}title'),
+            'description': _find_text(item, 'description', f'{_ATOM}summary'),
+            'content': _find_text(item, _CONTENT, f'{_ATOM}content'),
+            'published_at': _to_iso(_find_text(item, 'pubDate', f'{_ATOM}published', f'{_ATOM}updated')),
+            'url': link,
+            'source': self.name,
+            'category': _find_text(item, 'category'),
+            'tags': ', '.join(category.text.strip() for category in item.findall('category') if category.text),
+            'coins': self.coins,
+            'cover_image': '',
+        }
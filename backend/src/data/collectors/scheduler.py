@@ -0,0 +1,148 @@
+"""
+Планировщик сборщиков новостей.
+
+Источники обрабатываются параллельно в пуле потоков, каждый со своим ограничением
+частоты запросов; страницы одного источника запрашиваются последовательно от новых
+к старым до водяного знака (даты самой свежей новости, собранной в прошлый раз).
+Если обход упирается в max_pages раньше водяного знака, водяной знак не сдвигается,
+а следующий запуск продолжает обход с сохраненной страницы, пока не дойдет до него.
+Все записи передаются через очередь единственному писателю в NewsIndex, поэтому
+медленный источник не блокирует остальные, а запись в SQLite не конкурирует.
+"""
+
+import contextvars
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ...utils.profiling import stage
+from .coinmarketcap import CoinMarketCapNewsCollector
+from .rss import RssNewsCollector
+
+# Реестр типов сборщиков для секции collectors.sources конфигурационного файла
+COLLECTOR_TYPES = {
+    'coinmarketcap': CoinMarketCapNewsCollector,
+    'rss': RssNewsCollector,
+}
+
+_DONE = object()
+
+
+def build_collectors(sources):
+    """
+    Создание сборщиков по описаниям источников.
+
+    Args:
+        sources: Список словарей {type, name, ...параметры сборщика}
+
+    Returns:
+        list: Список сборщиков
+    """
+    collectors = []
+    for source in sources:
+        params = dict(source)
+        collector_type = params.pop('type')
+        if collector_type not in COLLECTOR_TYPES:
+            raise ValueError(f"Неизвестный тип сборщика: {collector_type}")
+        collectors.append(COLLECTOR_TYPES[collector_type](**params))
+    return collectors
+
+
+class CollectorScheduler:
+    def __init__(self, news_index, collectors, max_workers=8):
+        """
+        Args:
+            news_index: Нормализованное хранилище новостей NewsIndex
+            collectors: Список сборщиков BaseCollector
+            max_workers: Максимальное количество одновременно обрабатываемых источников
+        """
+        self.news_index = news_index
+        self.collectors = collectors
+        self.max_workers = max_workers
+
+    def _collect_source(self, collector, state, output):
+        """
+        Последовательный обход страниц одного источника до водяного знака.
+        Пакеты записей кладутся в очередь, по завершении - маркер _DONE
+        с новым состоянием источника (None при ошибке).
+        """
+        watermark = state['watermark']
+        first_page = state['resume_page'] or 1
+        newest = max(filter(None, [watermark, state['pending_watermark']]), default=None)
+        complete = False
+        try:
+            for page in range(first_page, first_page + collector.max_pages):
+                with stage(f'collect.{collector.name}.fetch'):
+                    items = collector.fetch_page(page)
+                if not items:
+                    complete = True
+                    break
+
+                with stage(f'collect.{collector.name}.normalize'):
+                    records = [record for position, item in enumerate(items)
+                               if (record := collector.normalize(item, position)) is not None]
+                dates = pd.to_datetime([record['published_at'] for record in records],
+                                       utc=True, errors='coerce', format='mixed')
+                dates = [None if pd.isna(date) else date.strftime('%Y-%m-%dT%H:%M:%S') for date in dates]
+
+                fresh = [record for record, date in zip(records, dates)
+                         if watermark is None or date is None or date >= watermark]
+                if fresh:
+                    output.put((collector.name, fresh))
+                known_dates = [date for date in dates if date is not None]
+                if known_dates and (newest is None or max(known_dates) > newest):
+                    newest = max(known_dates)
+
+                # Страница дошла до уже собранных новостей - дальше только старые
+                if watermark is not None and len(fresh) < len(records):
+                    complete = True
+                    break
+
+            if complete:
+                new_state = {'watermark': newest, 'resume_page': None, 'pending_watermark': None}
+            else:
+                # Между водяным знаком и последней страницей остались несобранные
+                # новости: водяной знак сохраняется, обход продолжится со следующей страницы
+                new_state = {'watermark': watermark, 'resume_page': page + 1, 'pending_watermark': newest}
+            output.put((collector.name, _DONE, new_state))
+        except Exception as e:
+            print(f"Ошибка сборщика {collector.name}: {e}")
+            output.put((collector.name, _DONE, None))
+
+    def run(self):
+        """
+        Запуск всех сборщиков.
+
+        Returns:
+            dict: Количество добавленных новостей по источникам
+        """
+        output = queue.Queue()
+        added = {collector.name: 0 for collector in self.collectors}
+        states = {collector.name: self.news_index.get_collector_state(collector.name)
+                  for collector in self.collectors}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for collector in self.collectors:
+                # Копия контекста на задачу: этапы сборщика попадают в отчет текущего запуска
+                executor.submit(contextvars.copy_context().run, self._collect_source,
+                                collector, states[collector.name], output)
+
+            remaining = len(self.collectors)
+            while remaining:
+                message = output.get()
+                if message[1] is _DONE:
+                    name, _, state = message
+                    remaining -= 1
+                    # Состояние обновляется только после успешного обхода источника
+                    if state is not None and state != states[name]:
+                        self.news_index.set_collector_state(name, **state)
+                    if state is not None and state['resume_page']:
+                        print(f"Источник {name}: обход остановлен по max_pages, "
+                              f"продолжение со страницы {state['resume_page']}")
+                    print(f"Источник {name}: добавлено {added[name]} новостей")
+                else:
+                    name, records = message
+                    with stage('collect.store'):
+                        added[name] += self.news_index.add_news(records)
+        return added
@@ -0,0 +1,10 @@
+"""
+Модуль для хранилищ данных:
+- Полнотекстовый индекс новостей с фасетами по монетам, тегам, источникам и датам
+- Хранилище эмбеддингов новостей (memory-mapped матрица)
+"""
+
+from .news_index import NewsIndex
+from .embedding_store import EmbeddingStore
+
+__all__ = ['NewsIndex', 'EmbeddingStore']
@@ -0,0 +1,181 @@
+"""
+Хранилище эмбеддингов новостей в виде memory-mapped матрицы.
+
+Строки матрицы выровнены с doc_id новостей из NewsIndex. Векторы хранятся
+в float16 (в 2 раза компактнее float32) или в int8 с масштабом на строку
+(в 4 раза компактнее), файлы дописываются в конец, поэтому добавление новых
+новостей не требует перезаписи архива.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+_DTYPES = ('float16', 'int8')
+
+
+class EmbeddingStore:
+    def __init__(self, path, dim=None, dtype='float16', encoder=None):
+        """
+        Открытие (или создание) хранилища эмбеддингов.
+
+        Args:
+            path: Директория хранилища
+            dim: Размерность векторов (обязательна при создании)
+            dtype: Формат хранения: 'float16' или 'int8'
+            encoder: Идентификатор кодировщика; при открытии существующего хранилища
+                должен совпадать с сохраненным (векторы разных кодировщиков несравнимы)
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._meta_path = self.path / 'meta.json'
+
+        if self._meta_path.exists():
+            with open(self._meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+            if dim is not None and dim != meta['dim']:
+                raise ValueError(f"Размерность хранилища {meta['dim']} не совпадает с запрошенной {dim}")
+            if encoder is not None and encoder != meta['encoder']:
+                raise ValueError(f"Хранилище построено кодировщиком {meta['encoder']}, запрошен {encoder}")
+            self.dim, self.dtype, self.count = meta['dim'], meta['dtype'], meta['count']
+            self.encoder = meta['encoder']
+        else:
+            if dim is None:
+                raise ValueError("Для создания хранилища необходимо указать dim")
+            if dtype not in _DTYPES:
+                raise ValueError(f"Неподдерживаемый формат {dtype}, допустимые: {_DTYPES}")
+            self.dim, self.dtype, self.count = int(dim), dtype, 0
+            self.encoder = encoder
+            self._write_meta()
+
+        self._vectors_path = self.path / f'vectors.{self.dtype}'
+        self._scales_path = self.path / 'scales.float32'
+        self._ids_path = self.path / 'ids.int64'
+        self._row_by_id = None
+
+    def __len__(self):
+        return self.count
+
+    def _write_meta(self):
+        """Атомарная запись метаданных: счетчик строк обновляется после дозаписи данных."""
+        tmp_path = self._meta_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'dim': self.dim, 'dtype': self.dtype, 'encoder': self.encoder, 'count': self.count}, file)
+        os.replace(tmp_path, self._meta_path)
+
+    def _truncate_to_count(self):
+        """
+        Отбрасывание хвостов файлов, дописанных прерванным append (после последней записи meta).
+        Вызывается только писателем перед дозаписью: читатель видит первые count строк
+        и не должен обрезать данные, которые писатель еще не отразил в meta.
+        """
+        sizes = [
+            (self._vectors_path, self.count * self.dim * np.dtype(self.dtype).itemsize),
+            (self._ids_path, self.count * 8),
+        ]
+        if self.dtype == 'int8':
+            sizes.append((self._scales_path, self.count * 4))
+        for path, size in sizes:
+            if path.exists() and path.stat().st_size > size:
+                with open(path, 'r+b') as file:
+                    file.truncate(size)
+
+    def _memmap(self, path, dtype, shape):
+        if self.count == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=shape)
+
+    def ids(self):
+        """
+        Returns:
+            np.ndarray: doc_id новостей в порядке строк матрицы
+        """
+        return self._memmap(self._ids_path, np.int64, (self.count,))
+
+    def max_id(self):
+        """
+        Returns:
+            int: Максимальный doc_id в хранилище (0, если хранилище пустое)
+        """
+        ids = self.ids()
+        return int(ids.max()) if len(ids) else 0
+
+    def raw_vectors(self):
+        """
+        Returns:
+            np.memmap: Матрица (count, dim) в формате хранения без декодирования
+        """
+        return self._memmap(self._vectors_path, np.dtype(self.dtype), (self.count, self.dim))
+
+    def vectors(self, rows=None):
+        """
+        Декодирование векторов в float32.
+
+        Args:
+            rows: Номера строк (по умолчанию вся матрица)
+
+        Returns:
+            np.ndarray: Матрица float32
+        """
+        raw = self.raw_vectors()
+        raw = raw if rows is None else raw[rows]
+        vectors = raw.astype(np.float32)
+        if self.dtype == 'int8':
+            scales = self._memmap(self._scales_path, np.float32, (self.count,))
+            scales = scales if rows is None else scales[rows]
+            vectors *= scales[:, None]
+        return vectors
+
+    def get(self, doc_ids):
+        """
+        Векторы по doc_id новостей.
+
+        Args:
+            doc_ids: Список doc_id
+
+        Returns:
+            np.ndarray: Матрица float32; для отсутствующих id поднимается KeyError
+        """
+        if self._row_by_id is None:
+            self._row_by_id = {int(doc_id): row for row, doc_id in enumerate(self.ids())}
+        rows = [self._row_by_id[int(doc_id)] for doc_id in doc_ids]
+        return self.vectors(np.asarray(rows, dtype=np.int64))
+
+    def append(self, doc_ids, vectors):
+        """
+        Дозапись векторов в конец хранилища.
+
+        Args:
+            doc_ids: doc_id новостей
+            vectors: Матрица float32 (n, dim)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Ожидалась матрица (n, {self.dim}), получено {vectors.shape}")
+        if len(doc_ids) != len(vectors):
+            raise ValueError("Количество doc_id не совпадает с количеством векторов")
+        if not len(vectors):
+            return
+
+        if self.dtype == 'int8':
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            encoded = np.round(vectors / scales[:, None]).astype(np.int8)
+        else:
+            encoded = vectors.astype(np.float16)
+
+        self._truncate_to_count()
+        if self.dtype == 'int8':
+            with open(self._scales_path, 'ab') as file:
+                file.write(scales.astype(np.float32).tobytes())
+        with open(self._vectors_path, 'ab') as file:
+            file.write(encoded.tobytes())
+        with open(self._ids_path, 'ab') as file:
+            file.write(doc_ids.tobytes())
+
+        self.count += len(vectors)
+        self._write_meta()
+        self._row_by_id = None
@@ -0,0 +1,633 @@
+"""
+Инвертированный индекс архива новостей на SQLite FTS5.
+
+Полнотекстовый поиск ведется по заголовку, описанию и очищенному от HTML контенту,
+фасеты (монеты, теги, источник, дата) хранятся в отдельных таблицах с индексами,
+отсортированными по дате публикации, поэтому выборка top-k последних новостей
+по монете или тегу не требует сортировки всего архива.
+
+Дневные агрегаты тональности по монетам (tone_daily) поддерживаются триггерами
+при добавлении новостей и обновлении их тональности, поэтому дашборд читает
+готовую таблицу вместо пересчета по всему архиву.
+"""
+
+import html
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Веса bm25 для колонок title, description, content
+_BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+# Версия схемы агрегатов tone_daily: при ее увеличении агрегаты пересчитываются один раз
+_AGGREGATES_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    doc_id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    news_id TEXT,
+    title TEXT,
+    description TEXT,
+    content TEXT,
+    source TEXT,
+    category TEXT,
+    coins TEXT,
+    tags TEXT,
+    published_at TEXT,
+    tone REAL
+);
+CREATE INDEX IF NOT EXISTS idx_news_published ON news(published_at);
+CREATE INDEX IF NOT EXISTS idx_news_source ON news(source COLLATE NOCASE, published_at);
+
+CREATE TABLE IF NOT EXISTS news_coins (
+    coin TEXT NOT NULL COLLATE NOCASE,
+    doc_id INTEGER NOT NULL,
+    published_at TEXT,
+    PRIMARY KEY (coin, doc_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS news_tags (
+    tag TEXT NOT NULL COLLATE NOCASE,
+    doc_id INTEGER NOT NULL,
+    published_at TEXT,
+    PRIMARY KEY (tag, doc_id)
+) WITHOUT ROWID;
+
+-- Дата не входит в первичный ключ: ключевые колонки WITHOUT ROWID таблиц
+-- не допускают NULL, и фасеты новостей без даты терялись бы при вставке
+CREATE INDEX IF NOT EXISTS idx_news_coins_published ON news_coins(coin, published_at);
+CREATE INDEX IF NOT EXISTS idx_news_tags_published ON news_tags(tag, published_at);
+CREATE INDEX IF NOT EXISTS idx_news_coins_doc ON news_coins(doc_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+    title, description, content,
+    content='news', content_rowid='doc_id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TABLE IF NOT EXISTS tone_daily (
+    coin TEXT NOT NULL COLLATE NOCASE,
+    day TEXT NOT NULL,
+    n_news INTEGER NOT NULL DEFAULT 0,
+    n_scored INTEGER NOT NULL DEFAULT 0,
+    tone_sum REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (coin, day)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_tone_daily_insert AFTER INSERT ON news_coins
+WHEN NEW.published_at IS NOT NULL
+BEGIN
+    INSERT INTO tone_daily (coin, day, n_news, n_scored, tone_sum)
+    SELECT NEW.coin, substr(NEW.published_at, 1, 10), 1, tone IS NOT NULL, coalesce(tone, 0)
+    FROM news WHERE doc_id = NEW.doc_id
+    ON CONFLICT (coin, day) DO UPDATE SET
+        n_news = n_news + excluded.n_news,
+        n_scored = n_scored + excluded.n_scored,
+        tone_sum = tone_sum + excluded.tone_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tone_daily_update AFTER UPDATE OF tone ON news
+WHEN NEW.published_at IS NOT NULL
+BEGIN
+    UPDATE tone_daily SET
+        n_scored = n_scored + (NEW.tone IS NOT NULL) - (OLD.tone IS NOT NULL),
+        tone_sum = tone_sum + coalesce(NEW.tone, 0) - coalesce(OLD.tone, 0)
+    WHERE day = substr(NEW.published_at, 1, 10)
+      AND coin IN (SELECT coin FROM news_coins WHERE doc_id = NEW.doc_id);
+END;
+
+CREATE TABLE IF NOT EXISTS index_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO index_meta (key, value) VALUES ('data_version', 0);
+
+CREATE TABLE IF NOT EXISTS collector_state (
+    source TEXT PRIMARY KEY,
+    watermark TEXT,
+    updated_at TEXT,
+    resume_page INTEGER,
+    pending_watermark TEXT
+);
+"""
+
+_RESULT_COLUMNS = (
+    'n.doc_id, n.url, n.title, n.description, n.source, n.category, '
+    'n.coins, n.tags, n.published_at, n.tone'
+)
+
+
+def clean_content(text):
+    """
+    Очистка HTML-контента новости: удаление тегов, раскрытие HTML-сущностей
+    и схлопывание пробельных символов.
+
+    Args:
+        text: Исходный HTML или обычный текст
+
+    Returns:
+        str: Очищенный текст
+    """
+    text = _text(text)
+    if not text:
+        return ''
+    text = html.unescape(_TAG_RE.sub(' ', text))
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def _text(value):
+    """Приведение значения ячейки DataFrame к строке (NaN и None -> '')."""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value)
+
+
+def _split_list(value):
+    """Разбор списка вида 'Bitcoin, Ethereum' в список уникальных значений."""
+    items = []
+    for item in _text(value).split(','):
+        item = item.strip()
+        if item and item not in items:
+            items.append(item)
+    return items
+
+
+def _to_iso(value):
+    """Приведение даты к строке ISO 8601 в UTC без таймзоны (сортируемой лексикографически)."""
+    timestamp = pd.to_datetime(value, utc=True, errors='coerce')
+    if pd.isna(timestamp):
+        return None
+    return timestamp.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _filter_iso(value):
+    """Дата фильтра в формате ISO 8601; для нераспознанной даты поднимается ValueError."""
+    iso = _to_iso(value)
+    if iso is None:
+        raise ValueError(f"Некорректная дата: {value}")
+    return iso
+
+
+def _day_end_iso(value):
+    """Граница 'до конца дня' для включительного фильтра по дате."""
+    return _to_iso(pd.Timestamp(_filter_iso(value)).normalize() + pd.Timedelta(days=1))
+
+
+def _to_fts_query(query):
+    """
+    Преобразование пользовательского запроса в безопасный запрос FTS5:
+    каждый токен берется в кавычки, токены объединяются по AND.
+    """
+    tokens = _TOKEN_RE.findall(query or '')
+    return ' '.join(f'"{token}"' for token in tokens)
+
+
+class NewsIndex:
+    def __init__(self, db_path):
+        """
+        Открытие (или создание) индекса новостей.
+
+        Args:
+            db_path: Путь к файлу базы SQLite
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA cache_size=-65536')
+        self.conn.executescript(_SCHEMA)
+
+        # Индексы, созданные до текущей схемы агрегатов, пересчитываются один раз
+        row = self.conn.execute("SELECT value FROM index_meta WHERE key = 'aggregates_version'").fetchone()
+        if row is None or row['value'] < _AGGREGATES_VERSION:
+            self.rebuild_aggregates()
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO index_meta (key, value) VALUES ('aggregates_version', ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    (_AGGREGATES_VERSION,)
+                )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute('SELECT count(*) FROM news').fetchone()[0]
+
+    def close(self):
+        """Закрытие соединения с базой."""
+        self.conn.close()
+
+    def add_news(self, news):
+        """
+        Инкрементальное добавление новостей в индекс. Новости, URL которых уже
+        есть в индексе, пропускаются.
+
+        Args:
+            news: DataFrame или список словарей с полями парсера
+                (id, title, description, content, published_at, url, source,
+                category, tags, coins; опционально tone)
+
+        Returns:
+            int: Количество добавленных новостей
+        """
+        news_df = news if isinstance(news, pd.DataFrame) else pd.DataFrame(news)
+        if news_df.empty or 'url' not in news_df.columns:
+            return 0
+
+        # Векторный разбор дат быстрее построчного pd.to_datetime
+        published = pd.Series(None, index=news_df.index, dtype=object)
+        if 'published_at' in news_df.columns:
+            timestamps = pd.to_datetime(news_df['published_at'], utc=True, errors='coerce', format='mixed')
+            published = timestamps.dt.strftime('%Y-%m-%dT%H:%M:%S').astype(object)
+            published = published.where(timestamps.notna(), None)
+
+        added = 0
+        with self._lock, self.conn:
+            for published_at, row in zip(published.tolist(), news_df.to_dict('records')):
+                url = _text(row.get('url'))
+                if not url:
+                    continue
+
+                title = _text(row.get('title'))
+                description = _text(row.get('description'))
+                content = clean_content(row.get('content'))
+                coins = _split_list(row.get('coins'))
+                tags = _split_list(row.get('tags'))
+                tone = row.get('tone')
+                tone = None if tone is None or pd.isna(tone) else float(tone)
+
+                cursor = self.conn.execute(
+                    'INSERT OR IGNORE INTO news (url, news_id, title, description, content, '
+                    'source, category, coins, tags, published_at, tone) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (url, _text(row.get('id')), title, description, content,
+                     _text(row.get('source')), _text(row.get('category')),
+                     ', '.join(coins), ', '.join(tags), published_at, tone)
+                )
+                if cursor.rowcount != 1:
+                    continue
+
+                doc_id = cursor.lastrowid
+                self.conn.execute(
+                    'INSERT INTO news_fts (rowid, title, description, content) VALUES (?, ?, ?, ?)',
+                    (doc_id, title, description, content)
+                )
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO news_coins (coin, published_at, doc_id) VALUES (?, ?, ?)',
+                    [(coin, published_at, doc_id) for coin in coins]
+                )
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO news_tags (tag, published_at, doc_id) VALUES (?, ?, ?)',
+                    [(tag, published_at, doc_id) for tag in tags]
+                )
+                added += 1
+            if added:
+                self._bump_version()
+        return added
+
+    def build_from_csv(self, csv_path, chunksize=50000):
+        """
+        Построение (дополнение) индекса из CSV архива новостей по частям,
+        без загрузки всего файла в память.
+
+        Args:
+            csv_path: Путь к CSV файлу, сохраненному CryptoNewsParser.save_news
+            chunksize: Количество строк в одной порции
+
+        Returns:
+            int: Количество добавленных новостей
+        """
+        added = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            added += self.add_news(chunk)
+            print(f"Проиндексировано {added} новостей...")
+        return added
+
+    def iter_documents(self, after_doc_id=0, batch_size=1000):
+        """
+        Последовательный обход новостей пакетами в порядке doc_id
+        (для инкрементального расчета признаков по новым новостям).
+
+        Args:
+            after_doc_id: Обход начинается с doc_id, большего указанного
+            batch_size: Размер пакета
+
+        Yields:
+            list: Пакет словарей {doc_id, title, description, content}
+        """
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    'SELECT doc_id, title, description, content FROM news '
+                    'WHERE doc_id > ? ORDER BY doc_id LIMIT ?',
+                    (int(after_doc_id), int(batch_size))
+                ).fetchall()
+            if not rows:
+                return
+            yield [dict(row) for row in rows]
+            after_doc_id = rows[-1]['doc_id']
+
+    def get_news(self, doc_ids):
+        """
+        Новости по doc_id в порядке переданного списка.
+
+        Args:
+            doc_ids: Список doc_id
+
+        Returns:
+            list: Список словарей с полями новости (отсутствующие doc_id пропускаются)
+        """
+        doc_ids = [int(doc_id) for doc_id in doc_ids]
+        if not doc_ids:
+            return []
+        with self._lock:
+            rows = self.conn.execute(
+                f'SELECT {_RESULT_COLUMNS} FROM news n '
+                f'WHERE n.doc_id IN ({", ".join("?" * len(doc_ids))})',
+                doc_ids
+            ).fetchall()
+        by_id = {row['doc_id']: dict(row) for row in rows}
+        return [by_id[doc_id] for doc_id in doc_ids if doc_id in by_id]
+
+    def set_tone(self, tone_by_url):
+        """
+        Запись оценок тональности новостей.
+
+        Args:
+            tone_by_url: Словарь {url: оценка тональности}
+
+        Returns:
+            int: Количество обновленных новостей
+        """
+        with self._lock, self.conn:
+            cursor = self.conn.executemany(
+                'UPDATE news SET tone = ? WHERE url = ?',
+                [(float(tone), url) for url, tone in tone_by_url.items()]
+            )
+            if cursor.rowcount:
+                self._bump_version()
+            return cursor.rowcount
+
+    def _bump_version(self):
+        """Увеличение версии данных (вызывается внутри транзакции записи)."""
+        self.conn.execute("UPDATE index_meta SET value = value + 1 WHERE key = 'data_version'")
+
+    def data_version(self):
+        """
+        Версия данных индекса, увеличивается при каждом добавлении новостей
+        или обновлении тональности. Используется клиентами для инвалидации кэша.
+
+        Returns:
+            int: Номер версии
+        """
+        with self._lock:
+            return self.conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'data_version'"
+            ).fetchone()[0]
+
+    def tone_matrix(self, coins=None):
+        """
+        Матрица средней дневной тональности из предрасчитанных агрегатов
+        (для бэктеста сигналов и построения признаков).
+
+        Args:
+            coins: Список монет (по умолчанию все)
+
+        Returns:
+            pd.DataFrame: Индекс - дата, колонки - монеты; NaN, если в день не было оцененных новостей
+        """
+        sql = 'SELECT coin, day, tone_sum / n_scored AS tone FROM tone_daily WHERE n_scored > 0'
+        params = []
+        if coins:
+            sql += f' AND coin IN ({", ".join("?" * len(coins))})'
+            params = list(coins)
+        with self._lock:
+            data = pd.read_sql_query(sql, self.conn, params=params)
+        matrix = data.pivot_table(index='day', columns='coin', values='tone', aggfunc='mean')
+        matrix.index = pd.to_datetime(matrix.index)
+        return matrix
+
+    def get_watermark(self, source):
+        """
+        Водяной знак сборщика: дата публикации самой свежей собранной новости источника.
+
+        Args:
+            source: Имя источника
+
+        Returns:
+            str: Дата в ISO 8601 или None, если источник еще не собирался
+        """
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT watermark FROM collector_state WHERE source = ?', (source,)
+            ).fetchone()
+        return row['watermark'] if row else None
+
+    def set_watermark(self, source, watermark):
+        """
+        Сохранение водяного знака сборщика (курсор незавершенного обхода сбрасывается).
+
+        Args:
+            source: Имя источника
+            watermark: Дата публикации самой свежей собранной новости
+        """
+        self.set_collector_state(source, watermark)
+
+    def get_collector_state(self, source):
+        """
+        Состояние сборщика: водяной знак и курсор незавершенного обхода.
+
+        Args:
+            source: Имя источника
+
+        Returns:
+            dict: {watermark, resume_page, pending_watermark}; resume_page - страница,
+                с которой продолжается обход, прерванный по max_pages, pending_watermark -
+                самая свежая дата, увиденная в этом обходе (станет водяным знаком после
+                его завершения)
+        """
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT watermark, resume_page, pending_watermark FROM collector_state WHERE source = ?',
+                (source,)
+            ).fetchone()
+        return dict(row) if row else {'watermark': None, 'resume_page': None, 'pending_watermark': None}
+
+    def set_collector_state(self, source, watermark, resume_page=None, pending_watermark=None):
+        """
+        Сохранение состояния сборщика.
+
+        Args:
+            source: Имя источника
+            watermark: Водяной знак
+            resume_page: Страница продолжения незавершенного обхода
+            pending_watermark: Самая свежая дата незавершенного обхода
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO collector_state (source, watermark, updated_at, resume_page, pending_watermark) "
+                "VALUES (?, ?, strftime('%Y-%m-%dT%H:%M:%S', 'now'), ?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET "
+                "watermark = excluded.watermark, updated_at = excluded.updated_at, "
+                "resume_page = excluded.resume_page, pending_watermark = excluded.pending_watermark",
+                (source, _to_iso(watermark), resume_page, _to_iso(pending_watermark))
+            )
+
+    def rebuild_aggregates(self):
+        """Полный пересчет таблицы дневных агрегатов тональности по монетам."""
+        with self.conn:
+            self.conn.execute('DELETE FROM tone_daily')
+            self.conn.execute(
+                'INSERT INTO tone_daily (coin, day, n_news, n_scored, tone_sum) '
+                'SELECT c.coin, substr(c.published_at, 1, 10), count(*), count(n.tone), '
+                'coalesce(sum(n.tone), 0) '
+                'FROM news_coins c JOIN news n ON n.doc_id = c.doc_id '
+                'WHERE c.published_at IS NOT NULL '
+                'GROUP BY c.coin COLLATE NOCASE, substr(c.published_at, 1, 10)'
+            )
+            self._bump_version()
+
+    def coins(self, limit=100):
+        """
+        Список монет, упорядоченный по количеству новостей.
+
+        Args:
+            limit: Максимальное количество монет
+
+        Returns:
+            list: Список словарей {coin, n_news}
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT coin, sum(n_news) AS n_news FROM tone_daily '
+                'GROUP BY coin ORDER BY n_news DESC LIMIT ?',
+                (int(limit),)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def tone_by_coin(self, coin, date_from=None, date_to=None):
+        """
+        Дневной ряд тональности новостей по монете из предрасчитанных агрегатов.
+
+        Args:
+            coin: Название монеты (без учета регистра)
+            date_from: Начальная дата (включительно)
+            date_to: Конечная дата (включительно); для нераспознанных дат поднимается ValueError
+
+        Returns:
+            list: Список словарей {day, n_news, n_scored, tone_sum, tone_mean},
+                упорядоченный по дате
+        """
+        sql = (
+            'SELECT day, n_news, n_scored, tone_sum, '
+            'CASE WHEN n_scored > 0 THEN tone_sum / n_scored END AS tone_mean '
+            'FROM tone_daily WHERE coin = ?'
+        )
+        params = [coin]
+        if date_from is not None:
+            sql += ' AND day >= ?'
+            params.append(_filter_iso(date_from)[:10])
+        if date_to is not None:
+            sql += ' AND day < ?'
+            params.append(_day_end_iso(date_to)[:10])
+        sql += ' ORDER BY day'
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, query=None, coin=None, tag=None, source=None,
+               date_from=None, date_to=None, limit=10):
+        """
+        Поиск новостей по тексту и фасетам.
+
+        Если задан текстовый запрос, результаты ранжируются по bm25 (заголовок
+        важнее описания, описание важнее контента), иначе возвращаются
+        последние по дате публикации новости, удовлетворяющие фасетам.
+
+        Args:
+            query: Текстовый запрос (токены объединяются по AND)
+            coin: Название монеты (без учета регистра)
+            tag: Тег (без учета регистра)
+            source: Источник новости (без учета регистра)
+            date_from: Нижняя граница даты публикации (включительно)
+            date_to: Верхняя граница даты публикации (включительно, по дню);
+                для нераспознанных дат поднимается ValueError
+            limit: Количество возвращаемых новостей
+
+        Returns:
+            list: Список словарей с полями новости, тональностью и релевантностью
+        """
+        fts_query = _to_fts_query(query)
+        where, params = [], []
+
+        # Без текстового запроса выборку ведет фасетная таблица, упорядоченная по дате
+        date_column = 'n.published_at'
+        if not fts_query and coin:
+            date_column = 'c.published_at'
+        elif not fts_query and tag:
+            date_column = 't.published_at'
+
+        if date_from is not None:
+            where.append(f'{date_column} >= ?')
+            params.append(_filter_iso(date_from))
+        if date_to is not None:
+            where.append(f'{date_column} < ?')
+            params.append(_day_end_iso(date_to))
+        if source:
+            where.append('n.source = ? COLLATE NOCASE')
+            params.append(source)
+
+        if fts_query:
+            if coin:
+                where.append('n.doc_id IN (SELECT doc_id FROM news_coins WHERE coin = ?)')
+                params.append(coin)
+            if tag:
+                where.append('n.doc_id IN (SELECT doc_id FROM news_tags WHERE tag = ?)')
+                params.append(tag)
+            sql = (
+                f'SELECT {_RESULT_COLUMNS}, '
+                f'bm25(news_fts, {", ".join(map(str, _BM25_WEIGHTS))}) AS score, '
+                "snippet(news_fts, -1, '[', ']', '...', 16) AS snippet "
+                'FROM news_fts JOIN news n ON n.doc_id = news_fts.rowid '
+                'WHERE news_fts MATCH ? '
+                + ''.join(f'AND {condition} ' for condition in where) +
+                'ORDER BY score LIMIT ?'
+            )
+            params = [fts_query] + params + [int(limit)]
+        else:
+            joins = ''
+            if coin:
+                joins += 'JOIN news_coins c ON c.doc_id = n.doc_id AND c.coin = ? '
+            if tag:
+                joins += 'JOIN news_tags t ON t.doc_id = n.doc_id AND t.tag = ? '
+            params = [value for value in (coin, tag) if value] + params
+            sql = (
+                f'SELECT {_RESULT_COLUMNS}, NULL AS score, NULL AS snippet '
+                f'FROM news n {joins}'
+                + ('WHERE ' + ' AND '.join(where) + ' ' if where else '') +
+                f'ORDER BY {date_column} DESC LIMIT ?'
+            )
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
@@ -3,6 +3,9 @@
 - Анализ технических индикаторов
 - Торговые сигналы
 - Комбинированные стратегии
+- Векторный бэктест сигналов по тональности новостей
 """
 
-__all__ = [] 
\ No newline at end of file
+from .backtest import backtest_grid, evaluate_window
+
+__all__ = ['backtest_grid', 'evaluate_window'] 
\ No newline at end of file
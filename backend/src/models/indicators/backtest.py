@@ -0,0 +1,177 @@
+"""
+Векторный бэктест торговых сигналов по тональности новостей.
+
+Сигнал: скользящее среднее дневной тональности по монете за window дней;
+позиция +1, если среднее выше threshold, -1 (при allow_short), если ниже -threshold,
+иначе 0. Позиция открывается на следующий день после сигнала. Портфель - равные
+веса по монетам, комиссия cost взимается с модуля изменения позиции.
+
+Все пороги для одного окна считаются одной операцией над массивом
+(thresholds, days, coins) без цикла по барам, окна распределяются по процессам.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+METRIC_COLUMNS = ['window', 'threshold', 'total_return', 'annual_return', 'volatility',
+                  'sharpe', 'max_drawdown', 'turnover']
+
+# Данные для процессов пула: передаются один раз через initializer, а не с каждой задачей
+_WORKER_DATA = {}
+
+# Бэктест запускается из потока многопоточного процесса (uvicorn, SQLite, профилировщик),
+# где fork небезопасен: процессы пула стартуют через forkserver (spawn, где его нет)
+_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+
+def align_tone_and_prices(tone, prices):
+    """
+    Выравнивание матриц тональности и цен по общим датам и монетам.
+
+    Args:
+        tone: DataFrame средней дневной тональности (индекс - дата, колонки - монеты)
+        prices: DataFrame цен закрытия (индекс - дата, колонки - монеты)
+
+    Returns:
+        tuple: (tone (days, coins) float32 без NaN, доходности (days, coins) float32, даты, монеты)
+    """
+    tone = tone.copy()
+    prices = prices.copy()
+    tone.index = pd.to_datetime(tone.index).normalize()
+    prices.index = pd.to_datetime(prices.index).normalize()
+    tone.columns = tone.columns.str.lower()
+    prices.columns = prices.columns.str.lower()
+
+    coins = prices.columns.intersection(tone.columns)
+    if coins.empty:
+        raise ValueError("Нет общих монет в данных тональности и цен")
+    prices = prices[coins].sort_index()
+    # Дни без новостей считаются нейтральными
+    tone = tone[coins].reindex(prices.index).fillna(0.0)
+    returns = prices.pct_change().fillna(0.0)
+    return (tone.to_numpy(np.float32), returns.to_numpy(np.float32), prices.index, coins)
+
+
+def rolling_mean(values, window):
+    """
+    Скользящее среднее по оси дней через кумулятивные суммы (O(days * coins) для любого окна).
+
+    Args:
+        values: Массив (days, coins)
+        window: Размер окна
+
+    Returns:
+        np.ndarray: Массив (days, coins); первые window - 1 строк заполнены NaN
+    """
+    cumsum = np.cumsum(np.vstack([np.zeros((1, values.shape[1]), values.dtype), values]), axis=0, dtype=np.float64)
+    result = np.full(values.shape, np.nan, dtype=np.float32)
+    result[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    return result
+
+
+def evaluate_window(tone, returns, window, thresholds, cost=0.001, allow_short=True,
+                    periods_per_year=365, chunk_size=64):
+    """
+    Метрики стратегии для одного окна и набора порогов.
+
+    Args:
+        tone: Массив тональности (days, coins)
+        returns: Массив доходностей (days, coins)
+        window: Окно сглаживания тональности
+        thresholds: Массив порогов
+        cost: Комиссия на единицу оборота
+        allow_short: Разрешены ли короткие позиции
+        periods_per_year: Количество периодов в году для годовых метрик
+        chunk_size: Количество порогов, обрабатываемых за раз (ограничение памяти)
+
+    Returns:
+        np.ndarray: Массив (len(thresholds), len(METRIC_COLUMNS))
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float32)
+    signal = rolling_mean(tone, window)
+    results = []
+
+    for start in range(0, len(thresholds), chunk_size):
+        levels = thresholds[start:start + chunk_size, None, None]
+        positions = (signal[None] > levels).astype(np.float32)
+        if allow_short:
+            positions -= (signal[None] < -levels)
+        # Позиция по сигналу дня t держится в день t + 1
+        positions = np.concatenate([np.zeros_like(positions[:, :1]), positions[:, :-1]], axis=1)
+
+        trades = np.abs(np.diff(positions, axis=1, prepend=0.0))
+        daily = (positions * returns[None] - cost * trades).mean(axis=2)
+        turnover = trades.mean(axis=(1, 2))
+
+        equity = np.cumprod(1.0 + daily.astype(np.float64), axis=1)
+        total_return = equity[:, -1] - 1.0
+        years = daily.shape[1] / periods_per_year
+        annual_return = np.sign(equity[:, -1]) * np.abs(equity[:, -1]) ** (1.0 / years) - 1.0
+        std = daily.std(axis=1)
+        volatility = std * np.sqrt(periods_per_year)
+        sharpe = np.divide(daily.mean(axis=1) * np.sqrt(periods_per_year), std,
+                           out=np.zeros_like(std), where=std > 0)
+        max_drawdown = (equity / np.maximum.accumulate(equity, axis=1) - 1.0).min(axis=1)
+
+        results.append(np.column_stack([
+            np.full(len(levels), window), levels[:, 0, 0], total_return, annual_return,
+            volatility, sharpe, max_drawdown, turnover,
+        ]))
+    return np.vstack(results)
+
+
+def _init_worker(tone, returns):
+    _WORKER_DATA['tone'] = tone
+    _WORKER_DATA['returns'] = returns
+
+
+def _evaluate_worker(window, thresholds, cost, allow_short, periods_per_year):
+    return evaluate_window(_WORKER_DATA['tone'], _WORKER_DATA['returns'], window, thresholds,
+                           cost=cost, allow_short=allow_short, periods_per_year=periods_per_year)
+
+
+def backtest_grid(tone, prices, windows, thresholds, cost=0.001, allow_short=True,
+                  periods_per_year=365, n_jobs=None):
+    """
+    Бэктест сетки параметров сигнала (window x threshold).
+
+    Args:
+        tone: DataFrame средней дневной тональности (индекс - дата, колонки - монеты)
+        prices: DataFrame цен закрытия (индекс - дата, колонки - монеты)
+        windows: Окна сглаживания тональности в днях
+        thresholds: Пороги тональности
+        cost: Комиссия на единицу оборота
+        allow_short: Разрешены ли короткие позиции
+        periods_per_year: Количество периодов в году
+        n_jobs: Количество процессов (по умолчанию - все ядра, 1 - без пула)
+
+    Returns:
+        pd.DataFrame: Метрики по каждой комбинации параметров, отсортированные по sharpe;
+            ValueError, если история цен короче всех окон или нет общих монет
+    """
+    tone_values, returns, _, _ = align_tone_and_prices(tone, prices)
+    windows = [int(window) for window in windows if 0 < int(window) <= len(returns)]
+    if not windows:
+        raise ValueError(f"История цен ({len(returns)} дней) короче минимального окна сигнала")
+    if not len(thresholds):
+        raise ValueError("Не задано ни одного порога сигнала")
+    n_jobs = n_jobs or os.cpu_count()
+    args = (cost, allow_short, periods_per_year)
+
+    if n_jobs == 1 or len(windows) == 1:
+        results = [evaluate_window(tone_values, returns, window, thresholds, *args) for window in windows]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=_MP_CONTEXT, initializer=_init_worker,
+                                 initargs=(tone_values, returns)) as executor:
+            results = list(executor.map(_evaluate_worker, windows, [thresholds] * len(windows),
+                                        *[[arg] * len(windows) for arg in args]))
+
+    report = pd.DataFrame(np.vstack(results), columns=METRIC_COLUMNS)
+    report['window'] = report['window'].astype(int)
+    return report.sort_values('sharpe', ascending=False, ignore_index=True)
@@ -3,6 +3,12 @@
 - Анализ тональности
 - Тематическое моделирование
 - Извлечение ключевых сущностей
+- Эмбеддинги новостей и поиск связанных новостей
 """
 
-__all__ = [] 
\ No newline at end of file
+from .ann_index import IVFIndex, brute_force_search
+from .embeddings import HashingEncoder, SentenceTransformerEncoder, encoder_name, get_encoder
+from .related_news import RelatedNews
+
+__all__ = ['IVFIndex', 'brute_force_search', 'HashingEncoder', 'SentenceTransformerEncoder',
+           'encoder_name', 'get_encoder', 'RelatedNews'] 
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""
+Приближенный поиск ближайших соседей (ANN) по эмбеддингам новостей.
+
+IVFIndex - инвертированный файл: векторы распределяются по n_lists кластерам
+сферического k-means, при поиске просматриваются только nprobe ближайших к запросу
+кластеров. Новые векторы добавляются без переобучения (назначаются ближайшему
+центроиду), поэтому индекс обновляется инкрементально вместе с хранилищем.
+Векторы предполагаются L2-нормированными, сходство - скалярное произведение (косинус).
+
+Инвертированные списки содержат только номера строк базовой матрицы: кандидаты
+скорятся по самой матрице (например, memory-mapped EmbeddingStore), поэтому индекс
+не дублирует векторы ни в памяти, ни на диске.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Размер обучающей подвыборки k-means на один кластер
+TRAIN_POINTS_PER_LIST = 64
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores, k):
+    """Индексы k максимальных значений по убыванию без полной сортировки."""
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def _gather(vectors, rows):
+    """Строки базовой матрицы в float32 (EmbeddingStore декодирует int8 с масштабами)."""
+    if hasattr(vectors, 'raw_vectors'):
+        return vectors.vectors(rows)
+    return np.asarray(vectors[rows], dtype=np.float32)
+
+
+def brute_force_search(vectors, queries, k=10):
+    """
+    Точный поиск ближайших соседей полным перебором (эталон для оценки recall).
+
+    Args:
+        vectors: Матрица базы (n, dim)
+        queries: Матрица запросов (m, dim)
+        k: Количество соседей
+
+    Returns:
+        tuple: (индексы строк (m, k), сходства (m, k))
+    """
+    scores = np.asarray(queries, dtype=np.float32) @ np.asarray(vectors, dtype=np.float32).T
+    rows = np.stack([_top_k(row, k) for row in scores])
+    return rows, np.take_along_axis(scores, rows, axis=1)
+
+
+class IVFIndex:
+    def __init__(self, dim, n_lists=1024, nprobe=16):
+        """
+        Args:
+            dim: Размерность векторов
+            n_lists: Количество кластеров (инвертированных списков)
+            nprobe: Количество просматриваемых кластеров при поиске
+        """
+        self.dim = int(dim)
+        self.n_lists = int(n_lists)
+        self.nprobe = int(nprobe)
+        self.centroids = None
+        # Размер базы на момент обучения центроидов: по нему решается, когда переобучать индекс
+        self.trained_size = 0
+        self._list_rows = []
+        self._pending = []
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    @property
+    def ntotal(self):
+        """Количество векторов в индексе."""
+        self._compact()
+        return int(sum(len(rows) for rows in self._list_rows))
+
+    def train(self, vectors, n_iter=10, max_train_size=None, seed=42):
+        """
+        Обучение центроидов сферическим k-means на выборке векторов.
+
+        Args:
+            vectors: Матрица (n, dim)
+            n_iter: Количество итераций k-means
+            max_train_size: Размер подвыборки для обучения (по умолчанию TRAIN_POINTS_PER_LIST * n_lists)
+            seed: Зерно генератора случайных чисел
+        """
+        rng = np.random.default_rng(seed)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.trained_size = len(vectors)
+        max_train_size = max_train_size or TRAIN_POINTS_PER_LIST * self.n_lists
+        if len(vectors) > max_train_size:
+            vectors = vectors[np.sort(rng.choice(len(vectors), max_train_size, replace=False))]
+
+        self.n_lists = min(self.n_lists, len(vectors))
+        centroids = vectors[rng.choice(len(vectors), self.n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = self._assign(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, vectors)
+            counts = np.bincount(assign, minlength=self.n_lists)
+            # Пустые кластеры переинициализируются случайными векторами
+            empty = np.flatnonzero(counts == 0)
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty))]
+            centroids = _normalize(sums)
+
+        self.centroids = centroids.astype(np.float32)
+        self._list_rows = [np.empty(0, dtype=np.int64) for _ in range(self.n_lists)]
+        self._pending = []
+
+    @staticmethod
+    def _assign(vectors, centroids, chunk_size=65536):
+        """Номер ближайшего центроида для каждого вектора (по частям, чтобы ограничить память)."""
+        return np.concatenate([
+            np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), chunk_size)
+        ]) if len(vectors) else np.empty(0, dtype=np.int64)
+
+    def add(self, rows, vectors):
+        """
+        Добавление векторов в индекс без переобучения центроидов. Векторы нужны
+        только для выбора кластера, в индексе сохраняются номера их строк.
+
+        Args:
+            rows: Номера строк векторов в базовой матрице
+            vectors: Матрица (n, dim)
+        """
+        if not self.is_trained:
+            raise RuntimeError("Индекс не обучен: вызовите train() перед add()")
+        vectors = np.asarray(vectors, dtype=np.float32)
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(vectors):
+            self._pending.append((rows, self._assign(vectors, self.centroids)))
+
+    def _compact(self):
+        """Перенос накопленных добавлений в инвертированные списки одним объединением на список."""
+        if not self._pending:
+            return
+        rows = np.concatenate([item[0] for item in self._pending])
+        assign = np.concatenate([item[1] for item in self._pending])
+        self._pending = []
+
+        order = np.argsort(assign, kind='stable')
+        bounds = np.searchsorted(assign[order], np.arange(self.n_lists + 1))
+        for list_no in range(self.n_lists):
+            members = order[bounds[list_no]:bounds[list_no + 1]]
+            if len(members):
+                self._list_rows[list_no] = np.concatenate([self._list_rows[list_no], rows[members]])
+
+    def search(self, queries, vectors, k=10, nprobe=None):
+        """
+        Поиск k ближайших соседей.
+
+        Args:
+            queries: Вектор (dim,) или матрица запросов (m, dim)
+            vectors: Базовая матрица (n, dim) любого числового типа (в том числе np.memmap)
+                или EmbeddingStore, строки которой были добавлены в индекс
+            k: Количество соседей
+            nprobe: Количество просматриваемых кластеров (по умолчанию self.nprobe)
+
+        Returns:
+            tuple: (номера строк (m, k), сходства (m, k)); недостающие позиции заполняются -1 и -inf
+        """
+        self._compact()
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+
+        result_rows = np.full((len(queries), k), -1, dtype=np.int64)
+        result_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+        for row, (query, lists) in enumerate(zip(queries, probes)):
+            # Сортировка номеров строк делает чтение memory-mapped матрицы последовательным
+            candidates = np.sort(np.concatenate([self._list_rows[list_no] for list_no in lists]))
+            if not len(candidates):
+                continue
+            scores = _gather(vectors, candidates) @ query
+            top = _top_k(scores, k)
+            result_rows[row, :len(top)] = candidates[top]
+            result_scores[row, :len(top)] = scores[top]
+        return result_rows, result_scores
+
+    def save(self, path):
+        """
+        Атомарное сохранение индекса в файл .npz.
+
+        Args:
+            path: Путь к файлу
+        """
+        if not self.is_trained:
+            raise RuntimeError("Нельзя сохранить необученный индекс")
+        self._compact()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        sizes = np.array([len(rows) for rows in self._list_rows], dtype=np.int64)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as file:
+            np.savez(
+                file,
+                params=np.array([self.dim, self.n_lists, self.nprobe, self.trained_size], dtype=np.int64),
+                centroids=self.centroids,
+                sizes=sizes,
+                rows=np.concatenate(self._list_rows),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Загрузка индекса из файла .npz.
+
+        Args:
+            path: Путь к файлу
+
+        Returns:
+            IVFIndex: Загруженный индекс
+        """
+        with np.load(path) as data:
+            dim, n_lists, nprobe, trained_size = data['params'].tolist()
+            index = cls(dim, n_lists=n_lists, nprobe=nprobe)
+            index.trained_size = trained_size
+            index.centroids = data['centroids']
+            bounds = np.concatenate([[0], np.cumsum(data['sizes'])])
+            rows = data['rows']
+            index._list_rows = [rows[bounds[i]:bounds[i + 1]] for i in range(n_lists)]
+        return index
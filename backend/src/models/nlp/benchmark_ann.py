@@ -0,0 +1,107 @@
+"""
+Бенчмарк приближенного поиска соседей IVFIndex против полного перебора NumPy.
+
+Измеряет recall@k (доля точных соседей, найденных индексом) и количество
+запросов в секунду для разных nprobe. По умолчанию используются синтетические
+кластеризованные данные; при указании --store - эмбеддинги из EmbeddingStore.
+
+Запуск из директории backend:
+    python -m src.models.nlp.benchmark_ann --n 200000 --dim 384
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from .ann_index import IVFIndex, brute_force_search
+from ...data.storage import EmbeddingStore
+
+
+def make_clustered_vectors(n, dim, n_clusters=2000, noise=1.0, seed=42):
+    """
+    Синтетические L2-нормированные векторы, сгруппированные вокруг случайных центров
+    (приближение к распределению эмбеддингов новостей о похожих событиях).
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, n_clusters, n)] + noise * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(found, expected):
+    """Средняя доля точных соседей среди найденных."""
+    return float(np.mean([len(np.intersect1d(f, e)) / len(e) for f, e in zip(found, expected)]))
+
+
+def run_benchmark(vectors, n_queries=1000, k=10, n_lists=1024, nprobes=(1, 4, 8, 16, 32, 64), seed=42):
+    """
+    Сравнение IVFIndex с полным перебором.
+
+    Args:
+        vectors: Матрица базы (n, dim), L2-нормированная
+        n_queries: Количество запросов (берутся из базы)
+        k: Количество соседей
+        n_lists: Количество кластеров IVF
+        nprobes: Значения nprobe для сравнения
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        list: Строки результатов {method, nprobe, recall, qps}
+    """
+    rng = np.random.default_rng(seed)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    queries = vectors[rng.choice(len(vectors), n_queries, replace=False)]
+    results = []
+
+    start = time.perf_counter()
+    expected = np.concatenate([brute_force_search(vectors, queries[i:i + 1], k)[0] for i in range(n_queries)])
+    brute_qps = n_queries / (time.perf_counter() - start)
+    results.append({'method': 'brute_force', 'nprobe': None, 'recall': 1.0, 'qps': brute_qps})
+
+    start = time.perf_counter()
+    for i in range(0, n_queries, 256):
+        brute_force_search(vectors, queries[i:i + 256], k)
+    results.append({'method': 'brute_force_batch256', 'nprobe': None, 'recall': 1.0,
+                    'qps': n_queries / (time.perf_counter() - start)})
+
+    index = IVFIndex(vectors.shape[1], n_lists=n_lists)
+    start = time.perf_counter()
+    index.train(vectors)
+    index.add(np.arange(len(vectors)), vectors)
+    index.search(queries[:1], vectors)
+    print(f"Построение IVF ({index.n_lists} кластеров): {time.perf_counter() - start:.1f} c")
+
+    for nprobe in nprobes:
+        start = time.perf_counter()
+        found = np.concatenate([index.search(query, vectors, k, nprobe=nprobe)[0] for query in queries])
+        qps = n_queries / (time.perf_counter() - start)
+        results.append({'method': 'ivf', 'nprobe': nprobe, 'recall': recall_at_k(found, expected), 'qps': qps})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store', help='Путь к EmbeddingStore (по умолчанию синтетические данные)')
+    parser.add_argument('--n', type=int, default=200000, help='Размер синтетической базы')
+    parser.add_argument('--dim', type=int, default=384, help='Размерность синтетических векторов')
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--n-lists', type=int, default=1024)
+    args = parser.parse_args()
+
+    if args.store:
+        vectors = EmbeddingStore(args.store).vectors()
+    else:
+        vectors = make_clustered_vectors(args.n, args.dim)
+    print(f"База: {vectors.shape[0]} векторов размерности {vectors.shape[1]}, k={args.k}")
+
+    results = run_benchmark(vectors, n_queries=min(args.queries, len(vectors)), k=args.k, n_lists=args.n_lists)
+    print(f"{'method':<22}{'nprobe':>8}{'recall@k':>10}{'qps':>10}")
+    for row in results:
+        nprobe = '-' if row['nprobe'] is None else row['nprobe']
+        print(f"{row['method']:<22}{nprobe:>8}{row['recall']:>10.3f}{row['qps']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Кодировщики новостей в векторные представления (эмбеддинги).
+
+- SentenceTransformerEncoder: предобученная мультиязычная модель sentence-transformers
+  (опциональная зависимость, вычисления на CPU пакетами)
+- HashingEncoder: быстрый кодировщик на хэшировании слов и биграмм без внешних
+  зависимостей, используется по умолчанию и в бенчмарках
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def document_text(news, max_chars=2000):
+    """
+    Текст новости для кодирования: заголовок, описание и начало контента.
+
+    Args:
+        news: Словарь с полями title, description, content
+        max_chars: Максимальная длина контента в символах
+
+    Returns:
+        str: Текст для кодирования
+    """
+    parts = [news.get('title') or '', news.get('description') or '', (news.get('content') or '')[:max_chars]]
+    return '. '.join(part for part in parts if part)
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class HashingEncoder:
+    def __init__(self, dim=384):
+        """
+        Кодировщик на хэшировании признаков (слова и биграммы слов).
+
+        Args:
+            dim: Размерность векторов
+        """
+        self.dim = int(dim)
+
+    def _features(self, text):
+        words = _WORD_RE.findall(text.lower())
+        return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+    def encode(self, texts):
+        """
+        Кодирование пакета текстов.
+
+        Args:
+            texts: Список текстов
+
+        Returns:
+            np.ndarray: L2-нормированная матрица float32 (len(texts), dim)
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter((zlib.crc32(feature.encode('utf-8')) for feature in self._features(text)),
+                                 dtype=np.uint32)
+            if not len(hashes):
+                continue
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], hashes % self.dim, signs)
+        # Сублинейное взвешивание частот, чтобы частые слова не доминировали
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return _normalize(vectors)
+
+
+class SentenceTransformerEncoder:
+    def __init__(self, model_name, batch_size=64):
+        """
+        Кодировщик на предобученной модели sentence-transformers (CPU).
+
+        Args:
+            model_name: Название модели
+            batch_size: Размер пакета при кодировании
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Для encoder: 'sentence_transformers' установите пакет sentence-transformers"
+            ) from e
+        self.model = SentenceTransformer(model_name, device='cpu')
+        self.batch_size = batch_size
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts):
+        """
+        Кодирование пакета текстов.
+
+        Args:
+            texts: Список текстов
+
+        Returns:
+            np.ndarray: L2-нормированная матрица float32 (len(texts), dim)
+        """
+        vectors = self.model.encode(list(texts), batch_size=self.batch_size, convert_to_numpy=True,
+                                    normalize_embeddings=True, show_progress_bar=False)
+        return vectors.astype(np.float32)
+
+
+def encoder_name(cfg):
+    """
+    Идентификатор пространства эмбеддингов кодировщика (сохраняется в метаданных
+    хранилища, чтобы не смешивать векторы разных кодировщиков одной размерности).
+
+    Args:
+        cfg: Секция embeddings конфигурационного файла
+
+    Returns:
+        str: Например, 'hashing' или 'sentence_transformers:<model_name>'
+    """
+    if cfg['encoder'] == 'sentence_transformers':
+        return f"sentence_transformers:{cfg['model_name']}"
+    return cfg['encoder']
+
+
+def get_encoder(cfg):
+    """
+    Создание кодировщика по секции embeddings конфигурационного файла.
+
+    Args:
+        cfg: Словарь с ключами encoder, dim, model_name, batch_size
+
+    Returns:
+        Кодировщик с атрибутом dim и методом encode(texts)
+    """
+    if cfg['encoder'] == 'sentence_transformers':
+        return SentenceTransformerEncoder(cfg['model_name'], batch_size=cfg['batch_size'])
+    if cfg['encoder'] == 'hashing':
+        return HashingEncoder(dim=cfg['dim'])
+    raise ValueError(f"Неизвестный кодировщик: {cfg['encoder']}")
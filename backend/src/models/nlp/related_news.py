@@ -0,0 +1,91 @@
+"""
+Поиск связанных новостей ("что еще писали об этом событии") по эмбеддингам.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+from .ann_index import IVFIndex
+from .embeddings import encoder_name, get_encoder
+from ...data.storage import EmbeddingStore
+
+
+class RelatedNews:
+    def __init__(self, news_index, cfg):
+        """
+        Args:
+            news_index: Индекс новостей NewsIndex
+            cfg: Секция embeddings конфигурационного файла
+        """
+        self.news_index = news_index
+        self.cfg = cfg
+        self._encoder = None
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _refresh(self):
+        """
+        Перезагрузка индекса и хранилища, если пайплайн эмбеддингов обновил файл индекса.
+        Оба объекта создаются заранее и заменяются одним кортежем под блокировкой,
+        поэтому параллельный запрос не получит новый индекс вместе со старым хранилищем.
+
+        Returns:
+            tuple: (ANN индекс, хранилище эмбеддингов)
+        """
+        mtime = os.path.getmtime(self.cfg['ann_path'])
+        with self._lock:
+            if self._state is None or self._state[2] != mtime:
+                # Индекс загружается первым: хранилище, открытое после него,
+                # содержит все проиндексированные строки
+                ann = IVFIndex.load(self.cfg['ann_path'])
+                store = EmbeddingStore(self.cfg['store_path'], encoder=encoder_name(self.cfg))
+                self._state = (ann, store, mtime)
+            return self._state[:2]
+
+    def _results(self, store, rows, scores, exclude=None):
+        found = rows >= 0
+        ids = store.ids()[rows[found]]
+        pairs = [(int(doc_id), float(score)) for doc_id, score in zip(ids, scores[found])
+                 if doc_id != exclude]
+        news = self.news_index.get_news([doc_id for doc_id, _ in pairs])
+        similarity = dict(pairs)
+        for item in news:
+            item['similarity'] = similarity[item['doc_id']]
+        return news
+
+    def related(self, doc_id, k=10):
+        """
+        Новости, семантически близкие к заданной.
+
+        Args:
+            doc_id: doc_id новости из NewsIndex
+            k: Количество новостей
+
+        Returns:
+            list: Список новостей с полем similarity; KeyError, если эмбеддинг не рассчитан
+        """
+        ann, store = self._refresh()
+        query = store.get([doc_id])[0]
+        rows, scores = ann.search(query, store, k + 1)
+        return self._results(store, rows[0], scores[0], exclude=doc_id)[:k]
+
+    def similar_to_text(self, text, k=10):
+        """
+        Новости, семантически близкие к произвольному тексту.
+
+        Args:
+            text: Текст запроса
+            k: Количество новостей
+
+        Returns:
+            list: Список новостей с полем similarity
+        """
+        ann, store = self._refresh()
+        with self._lock:
+            if self._encoder is None:
+                self._encoder = get_encoder(self.cfg)
+        query = self._encoder.encode([text])[0].astype(np.float32)
+        rows, scores = ann.search(query, store, k)
+        return self._results(store, rows[0], scores[0])
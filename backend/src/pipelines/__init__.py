@@ -1,8 +1,14 @@
 """
 Модуль для пайплайнов обработки данных и использования моделей:
+- Пайплайн сбора новостей
 - Пайплайн анализа новостей
+- Пайплайн расчета эмбеддингов новостей
 - Пайплайн прогнозирования цен
 - Пайплайн для торговых стратегий
 """
 
-__all__ = []
+from .backtest import pipeline_backtest
+from .news_collection import pipeline_collect
+from .news_embeddings import pipeline_embeddings
+
+__all__ = ['pipeline_backtest', 'pipeline_collect', 'pipeline_embeddings']
@@ -0,0 +1,41 @@
+"""
+Программа: Пайплайн бэктеста торговых сигналов по тональности новостей
+Версия: 1.0
+"""
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ..data.storage import NewsIndex
+from ..models.indicators.backtest import backtest_grid
+from ..utils.profiling import stage
+
+
+def pipeline_backtest(config_path):
+    """
+    Бэктест сетки параметров сигнала по тональности новостей и сохранение отчета
+    :param config_path: путь до файла с конфигурацией
+    :return: отчет с метриками по комбинациям параметров
+    """
+    with open(config_path, encoding='utf-8') as file:
+        config = yaml.load(file, Loader=yaml.FullLoader)
+    cfg = config['backtest']
+
+    # Цены в широком формате: колонка date и по колонке на монету
+    with stage('backtest.load_data'):
+        prices = pd.read_csv(cfg['prices_path'], index_col='date', parse_dates=['date'])
+        with NewsIndex(config['news']['index_path']) as news_index:
+            tone = news_index.tone_matrix()
+
+    with stage('backtest.grid'):
+        report = backtest_grid(
+            tone, prices,
+            windows=range(cfg['window_min'], cfg['window_max'] + 1),
+            thresholds=np.linspace(cfg['threshold_min'], cfg['threshold_max'], cfg['threshold_steps']),
+            cost=cfg['cost'],
+            allow_short=cfg['allow_short'],
+            n_jobs=cfg['n_jobs'],
+        )
+    report.to_csv(cfg['report_path'], index=False)
+    return report
@@ -0,0 +1,26 @@
+"""
+Программа: Пайплайн сбора новостей из всех источников
+Версия: 1.0
+"""
+
+import yaml
+
+from ..data.collectors import CollectorScheduler, build_collectors
+from ..data.storage import NewsIndex
+
+
+def pipeline_collect(config_path):
+    """
+    Параллельный сбор новостей из источников секции collectors.sources
+    в индекс новостей
+    :param config_path: путь до файла с конфигурацией
+    :return: количество добавленных новостей по источникам
+    """
+    with open(config_path, encoding='utf-8') as file:
+        config = yaml.load(file, Loader=yaml.FullLoader)
+    cfg = config['collectors']
+
+    with NewsIndex(config['news']['index_path']) as news_index:
+        scheduler = CollectorScheduler(news_index, build_collectors(cfg['sources']),
+                                       max_workers=cfg['max_workers'])
+        return scheduler.run()
@@ -0,0 +1,95 @@
+"""
+Программа: Пайплайн расчета эмбеддингов новостей и обновления ANN индекса
+Версия: 1.0
+"""
+
+import os
+
+import numpy as np
+import yaml
+
+from ..data.storage import NewsIndex, EmbeddingStore
+from ..models.nlp.ann_index import IVFIndex, TRAIN_POINTS_PER_LIST
+from ..models.nlp.embeddings import encoder_name, get_encoder, document_text
+from ..utils.profiling import stage
+
+
+def pipeline_embeddings(config_path):
+    """
+    Инкрементальный расчет эмбеддингов новостей, еще не попавших в хранилище,
+    пакетами на CPU, и дополнение ANN индекса. Индекс обучается, когда
+    в хранилище набирается ann_min_train_size векторов.
+    :param config_path: путь до файла с конфигурацией
+    :return: количество новых эмбеддингов
+    """
+    with open(config_path, encoding='utf-8') as file:
+        config = yaml.load(file, Loader=yaml.FullLoader)
+    cfg = config['embeddings']
+
+    with stage('embeddings.load_encoder'):
+        encoder = get_encoder(cfg)
+    store = EmbeddingStore(cfg['store_path'], dim=encoder.dim, dtype=cfg['dtype'], encoder=encoder_name(cfg))
+
+    added = 0
+    with NewsIndex(config['news']['index_path']) as news_index:
+        for batch in news_index.iter_documents(after_doc_id=store.max_id(), batch_size=cfg['batch_size']):
+            texts = [document_text(news, max_chars=cfg['max_chars']) for news in batch]
+            with stage('embeddings.encode'):
+                vectors = encoder.encode(texts)
+            with stage('embeddings.store'):
+                store.append([news['doc_id'] for news in batch], vectors)
+            added += len(batch)
+            print(f"Рассчитано {added} эмбеддингов...")
+
+    with stage('embeddings.ann_index'):
+        update_ann_index(store, cfg)
+    return added
+
+
+def train_ann_index(store, cfg, seed=42):
+    """
+    Обучение центроидов ANN индекса на случайной подвыборке строк хранилища:
+    декодируются только строки подвыборки, а не вся memory-mapped матрица.
+    :param store: хранилище эмбеддингов
+    :param cfg: секция embeddings конфигурационного файла
+    :param seed: зерно генератора случайных чисел
+    :return: обученный пустой индекс
+    """
+    ann = IVFIndex(store.dim, n_lists=cfg['n_lists'], nprobe=cfg['nprobe'])
+    rng = np.random.default_rng(seed)
+    train_size = min(len(store), TRAIN_POINTS_PER_LIST * ann.n_lists)
+    rows = np.sort(rng.choice(len(store), train_size, replace=False))
+    ann.train(store.vectors(rows), seed=seed)
+    ann.trained_size = len(store)
+    return ann
+
+
+def update_ann_index(store, cfg, chunk_size=100000):
+    """
+    Дополнение ANN индекса строками хранилища, которых в нем еще нет
+    (индекс хранит номера строк и заполняется в порядке строк хранилища).
+    Центроиды, обученные на ранней небольшой части архива, перестают описывать
+    распределение векторов, поэтому индекс переобучается целиком, когда хранилище
+    вырастает в ann_retrain_factor раз с момента обучения.
+    :param store: хранилище эмбеддингов
+    :param cfg: секция embeddings конфигурационного файла
+    :param chunk_size: количество векторов, декодируемых за один раз
+    :return: None
+    """
+    ann_path = cfg['ann_path']
+    if os.path.exists(ann_path):
+        ann = IVFIndex.load(ann_path)
+        if len(store) >= cfg['ann_retrain_factor'] * ann.trained_size:
+            print(f"Хранилище выросло с {ann.trained_size} до {len(store)} векторов, ANN индекс переобучается")
+            ann = train_ann_index(store, cfg)
+    elif len(store) >= cfg['ann_min_train_size']:
+        ann = train_ann_index(store, cfg)
+    else:
+        print(f"Недостаточно векторов для обучения ANN индекса: {len(store)}")
+        return
+
+    for start in range(ann.ntotal, len(store), chunk_size):
+        rows = np.arange(start, min(start + chunk_size, len(store)))
+        ann.add(rows, store.vectors(rows))
+    ann.save(ann_path)
+    print(f"ANN индекс сохранен: {ann.ntotal} векторов")
@@ -3,6 +3,11 @@
 - Оценка качества моделей
 - Визуализация данных и результатов
 - Вспомогательные функции
+- Реестр версий моделей
+- Профилирование этапов сбора данных и обучения
 """
 
-__all__ = [] 
\ No newline at end of file
+from .model_registry import ModelRegistry
+from .profiling import run_profile, stage, timed, SamplingProfiler
+
+__all__ = ['ModelRegistry', 'run_profile', 'stage', 'timed', 'SamplingProfiler'] 
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+Локальный реестр моделей с версионированием.
+
+Структура:
+    <root>/<name>/v0001/model.joblib  - артефакт модели
+    <root>/<name>/v0001/metadata.json - хэш данных, метрики, параметры, дата
+    <root>/<name>/CURRENT             - указатель на текущую версию
+
+Версия собирается во временной директории и переименовывается целиком,
+указатель CURRENT заменяется через os.replace, поэтому читатель никогда
+не видит частично записанную модель.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+
+MODEL_FILE = 'model.joblib'
+METADATA_FILE = 'metadata.json'
+CURRENT_FILE = 'CURRENT'
+
+# Имена моделей и версий используются как компоненты пути и не должны выходить за корень реестра
+_NAME_RE = re.compile(r'[\w-][\w.-]*')
+_VERSION_RE = re.compile(r'v\d{4,}')
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    SHA-256 файла, вычисляемый по частям.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        str: Хэш в шестнадцатеричном виде
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, root):
+        """
+        Args:
+            root: Корневая директория реестра
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _model_dir(self, name):
+        """Директория модели; для имени, которое может выйти за корень реестра, поднимается ValueError."""
+        if not _NAME_RE.fullmatch(name):
+            raise ValueError(f"Некорректное название модели: {name}")
+        return self.root / name
+
+    def _version_dir(self, name, version):
+        """
+        Директория существующей версии модели.
+        Для версии не в формате vNNNN поднимается ValueError, для отсутствующей - FileNotFoundError.
+        """
+        if not _VERSION_RE.fullmatch(version):
+            raise ValueError(f"Некорректная версия модели: {version}")
+        if version not in self.list_versions(name):
+            raise FileNotFoundError(f"Версия {version} модели {name} не найдена")
+        return self._model_dir(name) / version
+
+    def list_versions(self, name):
+        """
+        Returns:
+            list: Версии модели по возрастанию (например, ['v0001', 'v0002'])
+        """
+        model_dir = self._model_dir(name)
+        if not model_dir.exists():
+            return []
+        return sorted(path.name for path in model_dir.iterdir() if path.is_dir() and _VERSION_RE.fullmatch(path.name))
+
+    def current_version(self, name):
+        """
+        Returns:
+            str: Текущая версия модели или None, если модель не зарегистрирована
+        """
+        try:
+            return (self._model_dir(name) / CURRENT_FILE).read_text(encoding='utf-8').strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_current(self, name, version):
+        """
+        Атомарное переключение указателя текущей версии.
+
+        Args:
+            name: Название модели
+            version: Версия из list_versions(name)
+        """
+        if not (self._version_dir(name, version) / MODEL_FILE).exists():
+            raise FileNotFoundError(f"Версия {version} модели {name} не найдена")
+        pointer = self._model_dir(name) / CURRENT_FILE
+        tmp_path = pointer.with_name(f'{CURRENT_FILE}.{os.getpid()}.tmp')
+        tmp_path.write_text(version, encoding='utf-8')
+        os.replace(tmp_path, pointer)
+
+    def model_path(self, name, version=None):
+        """
+        Returns:
+            Path: Путь к артефакту модели (по умолчанию текущей версии)
+        """
+        version = version or self.current_version(name)
+        if version is None:
+            raise FileNotFoundError(f"Модель {name} не зарегистрирована")
+        return self._version_dir(name, version) / MODEL_FILE
+
+    def metadata(self, name, version=None):
+        """
+        Returns:
+            dict: Метаданные версии модели (по умолчанию текущей)
+        """
+        path = self.model_path(name, version).with_name(METADATA_FILE)
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def load(self, name, version=None):
+        """
+        Returns:
+            Модель указанной (по умолчанию текущей) версии
+        """
+        return joblib.load(self.model_path(name, version))
+
+    def register(self, name, model, params=None, metrics=None, data_path=None, promote=True):
+        """
+        Сохранение новой версии модели.
+
+        Args:
+            name: Название модели
+            model: Объект модели
+            params: Параметры обучения
+            metrics: Метрики качества
+            data_path: Путь к обучающим данным (для хэша данных)
+            promote: Сделать версию текущей
+
+        Returns:
+            str: Номер новой версии
+        """
+        return self._write_version(name, lambda path: joblib.dump(model, path),
+                                   params, metrics, data_path, promote)
+
+    def register_artifact(self, name, artifact_path, params=None, metrics=None, data_path=None, promote=True):
+        """
+        Сохранение новой версии из уже записанного файла модели (например, результата пайплайна обучения).
+
+        Args:
+            name: Название модели
+            artifact_path: Путь к файлу модели joblib
+            params, metrics, data_path, promote: см. register
+
+        Returns:
+            str: Номер новой версии
+        """
+        return self._write_version(name, lambda path: shutil.copyfile(artifact_path, path),
+                                   params, metrics, data_path, promote)
+
+    def _write_version(self, name, write_model, params, metrics, data_path, promote):
+        model_dir = self._model_dir(name)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix='.tmp-', dir=model_dir))
+        try:
+            write_model(tmp_dir / MODEL_FILE)
+            metadata = {
+                'name': name,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'data_path': str(data_path) if data_path else None,
+                'data_hash': file_hash(data_path) if data_path else None,
+                'params': params,
+                'metrics': metrics,
+            }
+
+            # Номер версии занимается переименованием директории: при гонке
+            # двух обучений rename в уже существующую версию завершится ошибкой
+            while True:
+                versions = self.list_versions(name)
+                number = int(versions[-1][1:]) + 1 if versions else 1
+                version = f'v{number:04d}'
+                metadata['version'] = version
+                with open(tmp_dir / METADATA_FILE, 'w', encoding='utf-8') as file:
+                    json.dump(metadata, file, ensure_ascii=False, indent=2, default=str)
+                try:
+                    os.rename(tmp_dir, model_dir / version)
+                    break
+                except OSError:
+                    if not (model_dir / version).exists():
+                        raise
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if promote:
+            self.set_current(name, version)
+        return version
@@ -0,0 +1,286 @@
+"""
+Профилирование запусков сбора данных и обучения.
+
+- run_profile(name, ...) - контекст запуска: собирает этапы и по завершении пишет
+  отчет run_report_<name>.json (длительности и пиковая память этапов)
+- stage(name) / timed(name) - контекстный менеджер и декоратор этапа; вне запуска
+  ничего не делают, поэтому ими можно размечать библиотечный код
+- Текущий запуск хранится в contextvars.ContextVar, поэтому одновременные запросы
+  (FastAPI выполняет синхронные обработчики в пуле потоков) пишут каждый в свой отчет.
+  Пул потоков контекст не наследует: задачи пула запускаются через
+  contextvars.copy_context().run, чтобы их этапы попадали в отчет запуска
+- SamplingProfiler - опциональный семплирующий профилировщик, сохраняющий стеки
+  в формате collapsed stacks (flamegraph.pl, speedscope, inferno); в run_profile
+  снимаются только потоки, выполняющие этапы этого запуска
+"""
+
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_MB = 1024 * 1024
+_active_run = contextvars.ContextVar('active_run', default=None)
+
+
+def rss_peak_mb():
+    """
+    Пиковый resident set size процесса с момента запуска (Linux/macOS).
+
+    Returns:
+        float: Пиковая память в МБ или None, если недоступно
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux возвращает КБ, macOS - байты
+    return round(peak / (_MB if sys.platform == 'darwin' else 1024), 1)
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005, thread_filter=None):
+        """
+        Семплирующий профилировщик: фоновый поток с заданным интервалом снимает
+        стеки потоков через sys._current_frames().
+
+        Args:
+            interval: Интервал между снимками в секундах
+            thread_filter: Функция (ident потока -> bool), отбирающая снимаемые потоки;
+                по умолчанию снимаются все потоки процесса
+        """
+        self.interval = interval
+        self.thread_filter = thread_filter
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_filter is not None and not self.thread_filter(thread_id)):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def save(self, path):
+        """
+        Сохранение стеков в формате collapsed stacks ("поток;функция;...;функция количество").
+
+        Args:
+            path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in self.samples.most_common():
+                file.write(f'{stack} {count}\n')
+
+
+class RunReport:
+    def __init__(self, name, trace_memory=False):
+        """
+        Отчет о запуске: список этапов с длительностью и пиковой памятью.
+
+        Args:
+            name: Название запуска
+            trace_memory: Измерять пиковую память Python по этапам через tracemalloc
+                (точнее RSS, но замедляет выполнение)
+        """
+        self.name = name
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.stages = []
+        self.finished = False
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Потоки, выполняющие этапы запуска прямо сейчас: {ident: глубина вложенности}
+        self._active_threads = {}
+
+    def is_active(self, thread_id):
+        """
+        Returns:
+            bool: Выполняет ли поток этап этого запуска
+        """
+        return thread_id in self._active_threads
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Этап запуска. Вложенные этапы получают составное имя 'родитель/этап'.
+        Пиковая память tracemalloc общая для процесса, поэтому при параллельных
+        этапах в разных потоках пик относится ко всем одновременно идущим этапам.
+        """
+        stack = self._stack()
+        full_name = f"{stack[-1]['name']}/{name}" if stack else name
+        frame = {'name': full_name, 'peak': 0}
+        if self.trace_memory:
+            # Пик до начала этапа сохраняется в родителях перед сбросом счетчика
+            peak = tracemalloc.get_traced_memory()[1]
+            for parent in stack:
+                parent['peak'] = max(parent['peak'], peak)
+            tracemalloc.reset_peak()
+        stack.append(frame)
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._active_threads[thread_id] = self._active_threads.get(thread_id, 0) + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                if self._active_threads[thread_id] == 1:
+                    del self._active_threads[thread_id]
+                else:
+                    self._active_threads[thread_id] -= 1
+            record = {
+                'name': full_name,
+                'thread': threading.current_thread().name,
+                'start_s': round(start - self._start, 4),
+                'duration_s': round(duration, 4),
+                'rss_peak_mb': rss_peak_mb(),
+            }
+            if self.trace_memory:
+                frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+                record['python_peak_mb'] = round(frame['peak'] / _MB, 2)
+            with self._lock:
+                self.stages.append(record)
+
+    def summary(self):
+        """
+        Returns:
+            dict: Агрегаты по именам этапов {name: {count, total_s, max_s}}
+        """
+        summary = {}
+        for record in self.stages:
+            item = summary.setdefault(record['name'], {'count': 0, 'total_s': 0.0, 'max_s': 0.0})
+            item['count'] += 1
+            item['total_s'] = round(item['total_s'] + record['duration_s'], 4)
+            item['max_s'] = max(item['max_s'], record['duration_s'])
+        return dict(sorted(summary.items(), key=lambda pair: -pair[1]['total_s']))
+
+    def to_dict(self):
+        return {
+            'run': self.name,
+            'started_at': self.started_at,
+            'duration_s': round(time.perf_counter() - self._start, 4),
+            'rss_peak_mb': rss_peak_mb(),
+            'summary': self.summary(),
+            'stages': sorted(self.stages, key=lambda record: record['start_s']),
+        }
+
+
+@contextmanager
+def run_profile(name, report_dir, sampling=False, sampling_interval=0.005, trace_memory=False):
+    """
+    Профилируемый запуск. Отчет сохраняется в <report_dir>/run_report_<name>.json,
+    при sampling=True стеки - в <report_dir>/profile_<name>.folded.
+
+    Args:
+        name: Название запуска
+        report_dir: Директория отчетов
+        sampling: Включить семплирующий профилировщик
+        sampling_interval: Интервал семплирования в секундах
+        trace_memory: Измерять пиковую память Python по этапам
+
+    Yields:
+        RunReport: Отчет текущего запуска
+    """
+    report_dir = Path(report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    report = RunReport(name, trace_memory=trace_memory)
+    # Снимаются только потоки этого запуска: простаивающие воркеры сервера
+    # и параллельные запросы в профиль не попадают
+    profiler = SamplingProfiler(sampling_interval, thread_filter=report.is_active) if sampling else None
+    if profiler is not None:
+        profiler.start()
+
+    token = _active_run.set(report)
+    try:
+        with report.stage(name):
+            yield report
+    finally:
+        _active_run.reset(token)
+        report.finished = True
+        data = report.to_dict()
+        if profiler is not None:
+            profiler.stop()
+            profile_path = report_dir / f'profile_{name}.folded'
+            profiler.save(profile_path)
+            data['profile'] = str(profile_path)
+        if started_tracing:
+            tracemalloc.stop()
+        with open(report_dir / f'run_report_{name}.json', 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+
+def stage(name):
+    """
+    Этап текущего профилируемого запуска (вне run_profile ничего не делает).
+
+    Args:
+        name: Название этапа
+    """
+    run = _active_run.get()
+    # Поток, переживший свой запуск, не дописывает этапы в уже сохраненный отчет
+    return run.stage(name) if run is not None and not run.finished else nullcontext()
+
+
+def timed(name=None):
+    """
+    Декоратор этапа: время выполнения функции записывается в текущий запуск.
+
+    Args:
+        name: Название этапа (по умолчанию имя функции)
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -3,22 +3,99 @@
 Версия: 1.0
 """
 
-import os
 import yaml
-import joblib
 import streamlit as st
 import pandas as pd
 from src.data.get_data import get_dataset
 from src.data.interpolate_missing_values_and_prepare import interpolate_missing_values
 from src.data.split_dataset import split_dataset
+from src.data.get_news_tone import get_data_version, get_coins, get_tone_by_coin
+from src.data.downsample_series import downsample_tone
 from src.plotting.get_plot import plot_key_rate, plot_features, plot_interpolate, plot_train_test_split, plot_test_forecast, plot_future_forecast
 from src.plotting.create_features import create_features
+from src.plotting.plot_news_tone import plot_news_tone
 from src.train.training import start_training, start_training_future, generate_forecast, generate_forecast_future
+from src.train.model_loader import HotModelLoader
 import time
 
 CONFIG_PATH = "../config/params.yml"
 
 
+# Кэшированные загрузки: Streamlit перезапускает скрипт при каждом действии
+# пользователя, поэтому тяжелые вычисления выполняются один раз на набор аргументов.
+# Данные с бэкенда дополнительно ключуются версией индекса новостей, так что
+# появление новых данных автоматически инвалидирует кэш.
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_dataset(parsing_config: dict) -> pd.DataFrame:
+    """
+    Загрузка датасета ключевой ставки (обновляется не реже раза в ttl секунд)
+    """
+    return get_dataset(cfg=parsing_config)
+
+
+@st.cache_data(show_spinner=False)
+def load_features(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Признаки по сезонам и дням недели
+    """
+    return create_features(data, col_datetime='date')
+
+
+@st.cache_data(show_spinner=False)
+def load_interpolated(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Фильтрация выбросов и интерполяция пропущенных значений
+    """
+    return interpolate_missing_values(data.copy(), 'key_rate')
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def load_data_version(endpoint: str) -> int:
+    """
+    Версия данных индекса новостей (проверяется не чаще раза в ttl секунд)
+    """
+    return get_data_version(endpoint)
+
+
+@st.cache_data(show_spinner=False)
+def load_coins(endpoint: str, data_version: int) -> list:
+    """
+    Список монет для выбранной версии данных
+    """
+    return get_coins(endpoint)
+
+
+@st.cache_data(show_spinner=False)
+def load_tone_by_coin(endpoint: str, coin: str, data_version: int, max_points: int) -> pd.DataFrame:
+    """
+    Прореженный ряд тональности по монете для выбранной версии данных
+    """
+    return downsample_tone(get_tone_by_coin(endpoint, coin), max_points=max_points)
+
+
+@st.cache_resource(show_spinner=False)
+def get_model_loader(root: str, name: str, poll_interval: float) -> HotModelLoader:
+    """
+    Загрузчик модели из реестра, общий для всех сессий Streamlit
+    """
+    return HotModelLoader(root, name, poll_interval=poll_interval)
+
+
+def load_registry_model(config: dict, name: str):
+    """
+    Текущая версия модели из реестра
+    :return: модель или None, если модель не зарегистрирована
+    """
+    registry = config['registry']
+    loaded = get_model_loader(registry['root'], name, registry['poll_interval']).get()
+    if loaded is None:
+        st.error("Model not found")
+        return None
+    version, model, metadata = loaded
+    st.success(f"Model loaded: {name} {version} ({metadata['created_at']})")
+    return model
+
+
 def main_page():
     """
     Страница с описанием проекта
@@ -63,7 +140,7 @@ def exploratory():
 
     # load dataset
     parsing_config = config['parsing']
-    data = get_dataset(cfg=parsing_config)
+    data = load_dataset(parsing_config)
     st.markdown("Последние курсы ставки рефинансирования ЦБ РФ:")
     st.write(data[:-5])
 
@@ -80,26 +157,53 @@ def exploratory():
 
     if features:
         st.markdown("Признаки по сезонам и дням недели:")
-        features = create_features(data, col_datetime='date')
+        features = load_features(data)
         fig, ax = plot_features(features)
         st.pyplot(fig)
 
     if interpolate:
         st.markdown("Фильтрация выбросов при помощи IQR и интерполяция пропущенных значений")
-        df_interpolated = data.copy()
-        df_interpolated = interpolate_missing_values(df_interpolated, 'key_rate')
+        df_interpolated = load_interpolated(data)
         fig, ax = plot_interpolate(data, df_interpolated)
         st.pyplot(fig)
     
     if plot_train_test:
         st.markdown("График с разделением на train, test")
-        df_split = data.copy()
-        df_interpolated = interpolate_missing_values(df_split, 'key_rate')
-        df_split = interpolate_missing_values(df_interpolated, 'key_rate')
-        df_train, df_test = split_dataset(df_split, config)
+        df_split = load_interpolated(data)
+        df_train, df_test = split_dataset(df_split.copy(), config)
         fig, ax = plot_train_test_split(df_train, df_test)
         st.pyplot(fig)
 
+def news_tone():
+    """
+    Тональность новостей по монетам из предрасчитанных агрегатов
+    """
+    st.markdown("# News tone by coin")
+
+    with open(CONFIG_PATH, encoding='utf-8') as file:
+        config = yaml.load(file, Loader=yaml.FullLoader)
+    endpoints = config['endpoints']
+    max_points = config['frontend']['max_plot_points']
+
+    if st.sidebar.button("Обновить данные"):
+        st.cache_data.clear()
+
+    data_version = load_data_version(endpoints['news_version'])
+    coins = load_coins(endpoints['news_coins'], data_version)
+    if not coins:
+        st.error("Нет новостей в индексе")
+        return
+
+    coin = st.sidebar.selectbox("Монета", coins)
+    data = load_tone_by_coin(endpoints['news_tone_by_coin'], coin, data_version, max_points)
+    if data.empty:
+        st.warning("Нет данных по выбранной монете")
+        return
+
+    st.write(f"Новостей: {int(data['n_news'].sum())}, из них с оценкой тональности: {int(data['n_scored'].sum())}")
+    fig, ax = plot_news_tone(data, coin)
+    st.pyplot(fig)
+
 def training():
     """
     Тренировка модели
@@ -127,12 +231,8 @@ def forecast_test_model():
     with open(CONFIG_PATH, encoding='utf-8') as file:
         config = yaml.load(file, Loader=yaml.FullLoader)
     # load model
-    model_path = config["train"]["model_path"]
-    if os.path.exists(model_path):
-        reg_model = joblib.load(model_path)
-        st.success("Model loaded")
-    else:
-        st.error("Model not found")
+    reg_model = load_registry_model(config, config["registry"]["test_model"])
+    if reg_model is None:
         return
 
     # Чтение DataFrame df_test в файл data/df_test.csv
@@ -184,12 +284,8 @@ def forecast_future_model():
     with open(CONFIG_PATH, encoding='utf-8') as file:
         config = yaml.load(file, Loader=yaml.FullLoader)
     # load model
-    model_path = config["train"]["model_path_future"]
-    if os.path.exists(model_path):
-        reg_model = joblib.load(model_path)
-        st.success("Model loaded")
-    else:
-        st.error("Model not found")
+    reg_model = load_registry_model(config, config["registry"]["future_model"])
+    if reg_model is None:
         return
 
     # Чтение DataFrame df в файл data/df.csv
@@ -224,6 +320,7 @@ def main():
     page_names_to_funcs = {
         "Описание проекта": main_page,
         "Exploratory data analysis": exploratory,
+        "News tone by coin": news_tone,
         "Tain test model Prophet": training,
         "Forecast key rate and plot test model": forecast_test_model,
         "Training test model Prophet future periods": training_future,
@@ -0,0 +1,31 @@
+"""
+Программа: Прореживание длинных временных рядов перед отрисовкой
+Версия: 1.0
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def downsample_tone(data: pd.DataFrame, max_points: int = 500) -> pd.DataFrame:
+    """
+    Прореживание дневного ряда тональности до max_points точек.
+    Соседние дни объединяются в корзины равного размера: количества новостей
+    и суммы тональности складываются, средняя тональность пересчитывается,
+    поэтому агрегаты остаются корректными (в отличие от выбора каждой n-й точки)
+    :param data: датасет с колонками day, n_news, n_scored, tone_sum
+    :param max_points: максимальное количество точек на графике
+    :return: прореженный датасет
+    """
+    if len(data) <= max_points:
+        return data
+
+    buckets = np.arange(len(data)) * max_points // len(data)
+    grouped = data.groupby(buckets).agg(
+        day=('day', 'first'),
+        n_news=('n_news', 'sum'),
+        n_scored=('n_scored', 'sum'),
+        tone_sum=('tone_sum', 'sum'),
+    )
+    grouped['tone_mean'] = grouped['tone_sum'] / grouped['n_scored'].where(grouped['n_scored'] > 0)
+    return grouped.reset_index(drop=True)
@@ -0,0 +1,54 @@
+"""
+Программа: Получение предрасчитанных агрегатов тональности новостей с бэкенда
+Версия: 1.0
+"""
+
+import pandas as pd
+import requests
+
+TONE_COLUMNS = ['day', 'n_news', 'n_scored', 'tone_sum', 'tone_mean']
+
+
+def get_data_version(endpoint: str) -> int:
+    """
+    Получение версии данных индекса новостей
+    :param endpoint: endpoint /news/version
+    :return: номер версии
+    """
+    response = requests.get(endpoint, timeout=10)
+    response.raise_for_status()
+    return response.json()['version']
+
+
+def get_coins(endpoint: str, limit: int = 100) -> list:
+    """
+    Получение списка монет, упорядоченного по количеству новостей
+    :param endpoint: endpoint /news/coins
+    :param limit: максимальное количество монет
+    :return: список названий монет
+    """
+    response = requests.get(endpoint, params={'limit': limit}, timeout=10)
+    response.raise_for_status()
+    return [item['coin'] for item in response.json()['coins']]
+
+
+def get_tone_by_coin(endpoint: str, coin: str, date_from=None, date_to=None) -> pd.DataFrame:
+    """
+    Получение дневного ряда тональности новостей по монете
+    :param endpoint: endpoint /news/tone_by_coin
+    :param coin: название монеты
+    :param date_from: начальная дата
+    :param date_to: конечная дата
+    :return: датасет с колонками day, n_news, n_scored, tone_sum, tone_mean
+    """
+    params = {'coin': coin}
+    if date_from is not None:
+        params['date_from'] = str(date_from)
+    if date_to is not None:
+        params['date_to'] = str(date_to)
+    response = requests.get(endpoint, params=params, timeout=30)
+    response.raise_for_status()
+
+    data = pd.DataFrame(response.json()['series'], columns=TONE_COLUMNS)
+    data['day'] = pd.to_datetime(data['day'])
+    return data
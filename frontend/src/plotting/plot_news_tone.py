@@ -0,0 +1,29 @@
+"""
+Программа: Графики тональности новостей по монетам
+Версия: 1.0
+"""
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+
+def plot_news_tone(data: pd.DataFrame, coin: str):
+    """
+    График средней тональности новостей и количества новостей по монете
+    :param data: датасет с колонками day, n_news, tone_mean
+    :param coin: название монеты
+    :return: fig, ax
+    """
+    fig, ax = plt.subplots(2, 1, figsize=(15, 8), sharex=True, gridspec_kw={'height_ratios': [2, 1]})
+
+    ax[0].plot(data['day'], data['tone_mean'], color='tab:blue', linewidth=1)
+    ax[0].axhline(0, color='grey', linestyle='--', linewidth=0.8)
+    ax[0].set_title(f'Средняя тональность новостей: {coin}')
+    ax[0].set_ylabel('Тональность')
+
+    ax[1].bar(data['day'], data['n_news'], color='tab:orange')
+    ax[1].set_title('Количество новостей')
+    ax[1].set_xlabel('Дата')
+
+    fig.tight_layout()
+    return fig, ax
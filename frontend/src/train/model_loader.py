@@ -0,0 +1,97 @@
+"""
+Программа: Загрузка текущей версии модели из реестра с горячей заменой
+Версия: 1.0
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import joblib
+
+VERSION_RE = re.compile(r'v\d{4,}')
+
+
+class HotModelLoader:
+    """
+    Загрузчик модели из реестра моделей бэкенда (<root>/<name>/CURRENT ->
+    <root>/<name>/<version>/model.joblib). При смене указателя CURRENT новая
+    версия загружается в фоновом потоке, а до окончания загрузки запросы
+    обслуживает предыдущая версия; замена - одно присваивание ссылки, поэтому
+    уже начатые отрисовки продолжают работать со своей версией модели.
+    """
+
+    def __init__(self, root: str, name: str, poll_interval: float = 5.0):
+        """
+        :param root: корневая директория реестра моделей
+        :param name: название модели
+        :param poll_interval: минимальный интервал между проверками новой версии, секунд
+        """
+        self.root = root
+        self.name = name
+        self.poll_interval = poll_interval
+        self._current = None  # (version, model, metadata)
+        self._loading = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+
+    def _read_pointer(self):
+        try:
+            with open(os.path.join(self.root, self.name, 'CURRENT'), encoding='utf-8') as file:
+                version = file.read().strip() or None
+        except FileNotFoundError:
+            return None
+        # Указатель на путь вне директории модели не загружается
+        if version is not None and not VERSION_RE.fullmatch(version):
+            print(f"Некорректная версия в указателе модели {self.name}: {version}")
+            return None
+        return version
+
+    def _load(self, version):
+        version_dir = os.path.join(self.root, self.name, version)
+        model = joblib.load(os.path.join(version_dir, 'model.joblib'))
+        with open(os.path.join(version_dir, 'metadata.json'), encoding='utf-8') as file:
+            metadata = json.load(file)
+        return version, model, metadata
+
+    def _load_in_background(self, version):
+        try:
+            loaded = self._load(version)
+        except Exception as e:
+            print(f"Не удалось загрузить версию {version} модели {self.name}: {e}")
+            loaded = None
+        with self._lock:
+            # Пока шла загрузка, указатель мог сменить версию: устаревшая загрузка
+            # не публикуется и не сбрасывает признак загрузки более новой версии
+            if self._loading == version:
+                if loaded is not None:
+                    self._current = loaded
+                self._loading = None
+
+    def get(self):
+        """
+        Текущая загруженная версия модели
+        :return: (version, model, metadata) или None, если модель не зарегистрирована
+        """
+        now = time.monotonic()
+        if self._current is not None and now - self._last_check < self.poll_interval:
+            return self._current
+        self._last_check = now
+
+        version = self._read_pointer()
+        if version is None:
+            return self._current
+        if self._current is None:
+            # Первая загрузка выполняется синхронно: отдавать еще нечего
+            with self._lock:
+                if self._current is None:
+                    self._current = self._load(version)
+            return self._current
+
+        with self._lock:
+            if version != self._current[0] and self._loading != version:
+                self._loading = version
+                threading.Thread(target=self._load_in_background, args=(version,), daemon=True).start()
+        return self._current